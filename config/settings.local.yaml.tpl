@@ -23,6 +23,9 @@
 #    collector_url: "rpc://jaeger-collector.com:4317"  # Tracing collector URL (may be internal)
 #    query_url: "http://jaeger-query.com"       # Tracing query URL
 #  cfssl: "cfssl"  # Path to the CFSSL library for TLS tests
+#  kubernetes:
+#    backend: "oc"                               # How to talk to the clusters, 'oc' (oc/kubectl binary) or 'rest' (direct API calls)
+#    informers: false                            # Cache looked up objects per kind and namespace using list+watch, needs 'rest' backend
 #  service_protection:
 #    system_project: "kuadrant-system"           # Namespace where Kuadrant resource resides
 #    project: "kuadrant"                         # Namespace where tests will run
@@ -1,6 +1,7 @@
 """Custom dynaconf loader for loading cluster settings and converting them to KubernetesClients"""
 
 from testsuite.kubernetes.client import KubernetesClient
+from testsuite.kubernetes.rest import Backend
 
 
 def inject_client(obj, base_client, path):
@@ -16,10 +17,12 @@ def inject_client(obj, base_client, path):
 def load(obj, env=None, silent=True, key=None, filename=None):
     """Creates all KubernetesClients"""
     control_plane = obj.setdefault("control_plane", {})
+    kubernetes = obj.get("kubernetes", {})
+    backend = Backend(kubernetes.get("backend", "oc") == "rest", bool(kubernetes.get("informers", False)))
 
     cluster = control_plane.setdefault("cluster", {})
     client = KubernetesClient(
-        cluster.get("project"), cluster.get("api_url"), cluster.get("token"), cluster.get("kubeconfig_path")
+        cluster.get("project"), cluster.get("api_url"), cluster.get("token"), cluster.get("kubeconfig_path"), backend
     )
     obj["control_plane"]["cluster"] = client
 
@@ -33,7 +36,7 @@ def load(obj, env=None, silent=True, key=None, filename=None):
     for value in clusters:
         clients.append(
             KubernetesClient(
-                value.get("project"), value.get("api_url"), value.get("token"), value.get("kubeconfig_path")
+                value.get("project"), value.get("api_url"), value.get("token"), value.get("kubeconfig_path"), backend
             )
         )
     if len(clients) > 0:
@@ -41,5 +44,9 @@ def load(obj, env=None, silent=True, key=None, filename=None):
 
     if cluster2 := control_plane.setdefault("cluster2", {}):
         obj["control_plane"]["cluster2"] = KubernetesClient(
-            cluster2.get("project"), cluster2.get("api_url"), cluster2.get("token"), cluster2.get("kubeconfig_path")
+            cluster2.get("project"),
+            cluster2.get("api_url"),
+            cluster2.get("token"),
+            cluster2.get("kubeconfig_path"),
+            backend,
         )
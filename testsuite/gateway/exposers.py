@@ -52,6 +52,7 @@ class StaticLocalHostname(Hostname):
     def client(self, **kwargs) -> KuadrantClient:
         headers = kwargs.setdefault("headers", {})
         headers["Host"] = self.hostname
+        kwargs.setdefault("shared_transport", True)
         protocol = "http"
         if self.verify or self.force_https:
             protocol = "https"
@@ -1,13 +1,16 @@
 """Module containing all gateway classes"""
 
-from typing import Any
+from typing import Any, Optional
 
 import openshift_client as oc
+from openshift_client import Missing, Model
 
 from testsuite.certificates import Certificate
 from testsuite.gateway import Gateway, GatewayListener
 from testsuite.kubernetes.client import KubernetesClient
 from testsuite.kubernetes import KubernetesObject, modify
+from testsuite.kubernetes.informer import get_informer
+from testsuite.kubernetes.lookup import get_object
 from testsuite.kuadrant.policy import Policy
 from testsuite.utils import check_condition, asdict
 
@@ -15,6 +18,10 @@ from testsuite.utils import check_condition, asdict
 class KuadrantGateway(KubernetesObject, Gateway):
     """Gateway object for Kuadrant"""
 
+    def __init__(self, dict_to_model=None, string_to_model=None, context=None):
+        super().__init__(dict_to_model, string_to_model, context)
+        self._address: Optional[tuple[str, str]] = None
+
     @classmethod
     def create_instance(cls, cluster: KubernetesClient, name, labels):
         """Creates new instance of Gateway"""
@@ -40,9 +47,8 @@ class KuadrantGateway(KubernetesObject, Gateway):
 
     def get_listener_dns_ttl(self, listener_name: str) -> int:
         """Returns TTL stored in DNSRecord CR under the specified Listener."""
-        dns_record = self.cluster.do_action(
-            "get", ["-o", "yaml", f"dnsrecords.kuadrant.io/{self.name()}-{listener_name}"], parse_output=True
-        )
+        name = f"{self.name()}-{listener_name}"
+        dns_record = get_object(self.cluster.context, "kuadrant.io/v1alpha1", "DNSRecord", name, cls=KubernetesObject)
         return dns_record.model.spec.endpoints[0].recordTTL
 
     @property
@@ -50,8 +56,29 @@ class KuadrantGateway(KubernetesObject, Gateway):
         return f"{self.name()}-istio"
 
     def external_ip(self) -> str:
-        with self.context:
-            return f"{self.refresh().model.status.addresses[0].value}:80"
+        """
+        Returns address of the Gateway, cached together with the resourceVersion of the Gateway it was read from.
+        The current resourceVersion on the server is read from the informer or by a metadata-only request
+        with the REST backend, so status changes are seen without reading the whole Gateway.
+        The oc backend has no cheap way to read it, so the Gateway is refreshed every time.
+        """
+        api_version, kind, name, namespace = self._rest_args()
+        model = None
+        cache = get_informer(self.context, api_version, kind, namespace)
+        if cache is not None and (current := cache.get(name)) is not None:
+            model = Model(current)
+            resource_version = model.metadata.resourceVersion
+        elif (rest := self.rest) is not None and (metadata := rest.get_metadata(api_version, kind, name, namespace)):
+            resource_version = metadata["metadata"]["resourceVersion"]
+        else:
+            with self.context:
+                return f"{self.refresh().model.status.addresses[0].value}:80"
+        if self._address is None or self._address[0] != resource_version:
+            if model is None or model.status.addresses is Missing:
+                with self.context:
+                    model = self.refresh().model
+            self._address = (model.metadata.resourceVersion, f"{model.status.addresses[0].value}:80")
+        return self._address[1]
 
     @property
     def cluster(self):
@@ -103,6 +130,7 @@ class KuadrantGateway(KubernetesObject, Gateway):
 
     def delete(self, ignore_not_found=True, cmd_args=None):
         res = super().delete(ignore_not_found, cmd_args)
+        self._address = None
         with self.cluster.context:
             # TLSPolicy does not delete certificates it creates
             oc.selector(f"secret/{self.cert_secret_name}").delete(ignore_not_found=True)
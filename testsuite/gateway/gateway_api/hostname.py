@@ -26,6 +26,7 @@ class StaticHostname(Hostname):
         self.tls_cert_getter = tls_cert_getter
 
     def client(self, **kwargs) -> KuadrantClient:
+        kwargs.setdefault("shared_transport", True)
         protocol = "http"
         if self.tls_cert_getter is not None and self.tls_cert_getter() is not None:
             protocol = "https"
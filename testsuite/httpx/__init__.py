@@ -1,14 +1,16 @@
 """Common classes for Httpx"""
 
+import asyncio
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 # I change return type of HTTPX client to Kuadrant Result
 # mypy: disable-error-code="override, return-value"
-from tempfile import NamedTemporaryFile
-from typing import Union, Iterable
+from typing import Union, Iterable, Callable, Iterator, Optional
 
-import backoff
-from httpx import Client, RequestError, USE_CLIENT_DEFAULT, Request
+import numpy as np
+from httpx import AsyncClient, Client, HTTPTransport, RequestError, USE_CLIENT_DEFAULT, Request
 from httpx._client import UseClientDefault
 from httpx._types import (
     URLTypes,
@@ -23,35 +25,89 @@ from httpx._types import (
 )
 
 from testsuite.certificates import Certificate
-
-
-def create_tmp_file(content: str):
-    """Creates temporary file and writes content into it"""
-    # I need them open until the client closes
-    # pylint: disable=consider-using-with
-    file = NamedTemporaryFile()
-    file.write(content.encode("utf-8"))
-    file.flush()
-    return file
+from testsuite.httpx.cassette import Cassette
+from testsuite.httpx.compact import CompactResultList
+from testsuite.httpx.correlation import Correlation, correlate
+from testsuite.httpx.errors import ErrorCategory, categorize
+from testsuite.httpx.expectations import Expectations
+from testsuite.httpx.pool import transport_pool
+from testsuite.httpx.resolver import CachingResolver, ResolvingTransport
+from testsuite.httpx.retry import RetryPolicy, RetryMetrics, shared_policy
+from testsuite.httpx.stats import ResultSummary, LatencyBreakdown, summarize, breakdown
+from testsuite.httpx.timing import PhaseTimings, PhaseSummary, PhaseTracer, AsyncPhaseTracer, summarize_phases
+from testsuite.httpx.traffic_log import TrafficLog
+from testsuite.httpx.tls import create_tmp_file, ssl_context  # pylint: disable=unused-import
+
+UPSTREAM_TIME_HEADER = "x-envoy-upstream-service-time"
 
 
 class Result:
     """Result from HTTP request"""
 
-    def __init__(self, retry_codes, response=None, error=None):
+    def __init__(
+        self,
+        retry_codes,
+        response=None,
+        error=None,
+        started: float = None,
+        latency: float = None,
+        timings: PhaseTimings = None,
+        correlation: Correlation = None,
+    ):
+        """
+        :param started: Unix timestamp of the moment the request was sent
+        :param latency: Time in seconds until the response (or error) was received
+        :param timings: Time spent in each phase of the request (connect, TLS, send, wait, receive)
+        :param correlation: Request and trace ids sent with the request, if the client correlates requests
+        """
         self.response = response
         self.error = error
         self.retry_codes = retry_codes
+        self.started = started
+        self.latency = latency
+        self.timings = timings
+        self.correlation = correlation
+
+    @property
+    def error_category(self) -> ErrorCategory:
+        """Returns category of the error which prevented the request from getting a response"""
+        return categorize(self.error)
+
+    @property
+    def upstream_time(self) -> Optional[float]:
+        """Time in seconds the upstream took to respond as reported by Envoy, None if unknown"""
+        if self.response is None or UPSTREAM_TIME_HEADER not in self.response.headers:
+            return None
+        try:
+            return int(self.response.headers[UPSTREAM_TIME_HEADER]) / 1000
+        except ValueError:
+            return None
+
+    @property
+    def gateway_overhead(self) -> Optional[float]:
+        """
+        Time in seconds spent outside the upstream, i.e. in gateway filters (ext_authz, rate limiting) and network.
+        Measured from sending the request until receiving response headers, if phase timings are known.
+        """
+        upstream = self.upstream_time
+        total = self.latency if self.timings is None or self.timings.wait is None else self.timings.wait
+        if upstream is None or total is None:
+            return None
+        return max(0.0, total - upstream)
+
+    @property
+    def upload_throughput(self) -> Optional[float]:
+        """Bytes per second at which the request (headers and body) was sent, None if unknown"""
+        if self.response is None or self.timings is None or not self.timings.send:
+            return None
+        size = int(self.response.request.headers.get("Content-Length", 0))
+        return size / self.timings.send
 
     def should_backoff(self):
         """True, if the Result can be considered an instability and should be retried"""
-        return (
-            self.has_dns_error()
-            or (self.error is None and self.status_code in self.retry_codes)
-            or self.has_error("Server disconnected without sending a response.")
-            or self.has_error("timed out")
-            or self.has_error("SSL: UNEXPECTED_EOF_WHILE_READING")
-        )
+        if self.error is None:
+            return self.status_code in self.retry_codes
+        return self.error_category.retryable
 
     def has_error(self, error_msg: str) -> bool:
         """True, if the request failed and an error with message was returned"""
@@ -59,19 +115,19 @@ class Result:
 
     def has_dns_error(self):
         """True, if the result failed due to DNS failure"""
-        return self.has_error("Name or service not known") or self.has_error("No address associated with hostname")
+        return self.error_category == ErrorCategory.DNS
 
     def has_cert_verify_error(self):
         """True, if the result failed due to TLS certificate verification failure"""
-        return self.has_error("SSL: CERTIFICATE_VERIFY_FAILED")
+        return self.error_category == ErrorCategory.CERT_VERIFY
 
     def has_unknown_ca_error(self):
         """True, if the result failed due to TLS unknown certificate authority failure"""
-        return self.has_error("SSL: TLSV1_ALERT_UNKNOWN_CA")
+        return self.error_category == ErrorCategory.UNKNOWN_CA
 
     def has_cert_required_error(self):
         """True, if the result failed due to TLS certificate absense failure"""
-        return self.has_error("SSL: TLSV13_ALERT_CERTIFICATE_REQUIRED")
+        return self.error_category == ErrorCategory.CERT_REQUIRED
 
     def __getattr__(self, item):
         """For backwards compatibility"""
@@ -85,106 +141,363 @@ class Result:
         return f"Result[error={self.error}]"
 
 
-class ResultList(list):
+class ResultList(Expectations, list):
     """List-like object for Result"""
 
-    def assert_all(self, status_code):
-        """Assert all responses that contain certain status code"""
-        for request in self:
-            assert request.status_code == status_code, (
-                f"Status code assertion failed for request {self.index(request)+1} out of {len(self)} requests: "
-                f"{request} != {status_code}"
-            )
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return ResultList(super().__getitem__(item))
+        return super().__getitem__(item)
+
+    def summary(self, window: float = 1.0) -> ResultSummary:
+        """Returns latency, status code and throughput statistics, throughput is computed in `window` seconds"""
+        return summarize(
+            np.fromiter((0 if r.response is None else r.response.status_code for r in self), np.uint16, len(self)),
+            np.fromiter((np.nan if r.latency is None else r.latency for r in self), np.float64, len(self)),
+            np.fromiter((np.nan if r.started is None else r.started for r in self), np.float64, len(self)),
+            np.fromiter((r.error_category for r in self), np.uint8, len(self)),
+            window,
+        )
+
+    def breakdown(self) -> LatencyBreakdown:
+        """Returns latency split into upstream time and gateway overhead, e.g. to see the cost of Kuadrant policies"""
+        upstream = [result.upstream_time for result in self]
+        overhead = [result.gateway_overhead for result in self]
+        return breakdown(
+            np.fromiter((np.nan if value is None else value for value in upstream), np.float64, len(self)),
+            np.fromiter((np.nan if value is None else value for value in overhead), np.float64, len(self)),
+        )
 
+    def phases(self) -> PhaseSummary:
+        """Returns statistics of time spent in each phase of the requests, e.g. to find out which layer is slow"""
+        return summarize_phases(result.timings for result in self)
 
-class KuadrantClient(Client):
-    """Httpx client which retries unstable requests"""
+
+class RateLimitCounts:
+    """Counts of rate limited and allowed requests among `results`"""
+
+    results: ResultList
+
+    @property
+    def allowed(self) -> int:
+        """Number of requests that were not rate limited"""
+        return sum(1 for result in self.results if result.response is not None and result.status_code != 429)
+
+    @property
+    def rejected(self) -> int:
+        """Number of rate limited requests"""
+        return sum(1 for result in self.results if result.response is not None and result.status_code == 429)
+
+
+class _ResultClient:
+    """Retrying, correlation and measuring of requests shared by KuadrantClient and AsyncKuadrantClient"""
 
     def __init__(
         self,
-        *,
-        verify: Union[Certificate, bool] = True,
-        cert: Certificate = None,
         retry_codes: Iterable[int] = None,
+        retry_policy: RetryPolicy = None,
+        correlate_requests: bool = False,
+        traffic_log: TrafficLog = None,
         **kwargs,
     ):
-        self.files = []
         self.retry_codes = retry_codes or {503}
-        _verify = None
-        if isinstance(verify, Certificate):
-            verify_file = create_tmp_file(verify.chain)
-            self.files.append(verify_file)
-            _verify = verify_file.name
-        _cert = None
-        if cert:
-            cert_file = create_tmp_file(cert.chain)
-            self.files.append(cert_file)
-            key_file = create_tmp_file(cert.key)
-            self.files.append(key_file)
-            _cert = (cert_file.name, key_file.name)
-
-        # Mypy does not understand the typing magic I have done
-        self.verify = _verify or verify
-        super().__init__(verify=self.verify, cert=_cert or cert, **kwargs)  # type: ignore
-
-    def close(self) -> None:
-        super().close()
-        for file in self.files:
-            file.close()
-        self.files = []
+        self.retry_policy = retry_policy or shared_policy()
+        self._retry_metrics = RetryMetrics()
+        self.correlate_requests = correlate_requests
+        self.traffic_log = traffic_log
+        super().__init__(**kwargs)
 
     def add_retry_code(self, code):
         """Add a new retry code to"""
         self.retry_codes.add(code)
 
-    # pylint: disable=too-many-locals
-    @backoff.on_predicate(backoff.fibo, lambda result: result.should_backoff(), max_tries=8, jitter=None)
-    def request(
+    @property
+    def retry_metrics(self) -> RetryMetrics:
+        """Returns statistics about requests retried by this client"""
+        return self._retry_metrics
+
+    def _prepare(self, headers, extensions, tracer_class) -> tuple:
+        """Returns headers and extensions of the request with tracer and correlation headers added"""
+        extensions = dict(extensions or {})
+        extensions["trace"] = tracer_class(extensions.get("trace"))
+        correlation = None
+        if self.correlate_requests:
+            headers, correlation = correlate(headers)
+        return headers, extensions, correlation
+
+    def _result(self, started: float, start: float, extensions, correlation, response=None, error=None) -> Result:
+        """Returns Result of a request sent at `started` (time.time()) and `start` (time.perf_counter())"""
+        return Result(
+            self.retry_codes,
+            response=response,
+            error=error,
+            started=started,
+            latency=time.perf_counter() - start,
+            timings=extensions["trace"].timings,
+            correlation=correlation,
+        )
+
+    def _record(self, result: Result, method: str, url) -> Result:
+        """Reports final Result of the request to the TrafficLog"""
+        if self.traffic_log is not None:
+            self.traffic_log.record(result, method, url)
+        return result
+
+
+class KuadrantClient(_ResultClient, Client):
+    """Httpx client which retries unstable requests"""
+
+    def __init__(
+        self,
+        *,
+        verify: Union[Certificate, bool] = True,
+        cert: Certificate = None,
+        retry_codes: Iterable[int] = None,
+        retry_policy: RetryPolicy = None,
+        shared_transport: bool = False,
+        cassette: Cassette = None,
+        correlate_requests: bool = False,
+        resolver: CachingResolver = None,
+        traffic_log: TrafficLog = None,
+        **kwargs,
+    ):
+        """
+        :param retry_policy: Decides which unstable requests are retried, by default clients share one per host
+        :param shared_transport: Reuse connections of other clients through the session-wide TransportPool,
+            ignored if the connection handling is configured explicitly
+        :param cassette: Records all traffic into the Cassette or replays it from there without any network traffic,
+            replayed requests are retried exactly as they were recorded, without waiting
+        :param correlate_requests: Send unique `x-request-id` and `traceparent` headers with each request
+        :param resolver: Resolve hostnames through its nameservers instead of the system resolver
+        :param traffic_log: Aggregates Results of all requests, instead of logging each of them
+        """
+        self.http2 = http2 = kwargs.get("http2", False)
+        self.cassette = cassette
+        if shared_transport and not {"transport", "limits", "proxy", "mounts", "trust_env"} & kwargs.keys():
+            kwargs["transport"] = transport_pool.transport(verify, cert, http2)
+        if (resolver is not None or cassette is not None) and kwargs.get("transport") is None:
+            kwargs["transport"] = HTTPTransport(verify=ssl_context(verify, cert, http2), http2=http2)
+        if resolver is not None:
+            kwargs["transport"] = ResolvingTransport(kwargs["transport"], resolver)
+        if cassette is not None:
+            kwargs["transport"] = cassette.transport(kwargs["transport"])
+        super().__init__(
+            retry_codes,
+            retry_policy,
+            correlate_requests,
+            traffic_log,
+            verify=ssl_context(verify, cert, http2),
+            **kwargs,
+        )
+
+    def request(self, method: str, url, **kwargs) -> Result:
+        """Sends the request and retries it according to the RetryPolicy, while it is unstable"""
+        if self.cassette is not None and not self.cassette.record:
+            return self._replay(method, url, **kwargs)
+        attempts = self.retry_policy.begin(self._merge_url(url).host, self._retry_metrics)
+        while True:
+            result = self._request(method, url, **kwargs)
+            delay = attempts.next_delay(result.should_backoff())
+            if delay is None:
+                return self._record(result, method, self._merge_url(url))
+            time.sleep(delay)
+
+    def _replay(self, method: str, url, **kwargs) -> Result:
+        """Replays the request and its recorded retries, the RetryPolicy and its waiting are not involved"""
+        while True:
+            result = self._request(method, url, **kwargs)
+            request = result.response.request if result.error is None else result.error.request
+            if not result.should_backoff() or not self.cassette.remaining(request):  # type: ignore[union-attr]
+                return self._record(result, method, self._merge_url(url))
+
+    def send_once(self, method: str, url, **kwargs) -> Result:
+        """Sends the request without any retries, e.g. under load, where backoff sleeps would skew the measurements"""
+        return self._record(self._request(method, url, **kwargs), method, self._merge_url(url))
+
+    def _request(
         self,
         method: str,
         url,
         *,
-        content=None,
-        data=None,
-        files=None,
-        json=None,
-        params=None,
         headers=None,
-        cookies=None,
         auth=None,
         follow_redirects=None,
         timeout=None,
         extensions=None,
+        **kwargs,
     ) -> Result:
+        headers, extensions, correlation = self._prepare(headers, extensions, PhaseTracer)
+        started, start = time.time(), time.perf_counter()
         try:
             response = super().request(
                 method,
                 url,
-                content=content,
-                data=data,
-                files=files,
-                json=json,
-                params=params,
                 headers=headers,
-                cookies=cookies,
                 auth=auth,
                 follow_redirects=follow_redirects,
                 timeout=timeout,
                 extensions=extensions,
+                **kwargs,
             )
-            return Result(self.retry_codes, response=response)
         except RequestError as e:
-            return Result(self.retry_codes, error=e)
+            return self._result(started, start, extensions, correlation, error=e)
+        return self._result(started, start, extensions, correlation, response=response)
 
     def get(self, *args, **kwargs) -> Result:
         return super().get(*args, **kwargs)
 
-    def get_many(self, url, count, *, params=None, headers=None, auth=None) -> ResultList:
-        """Send multiple `GET` requests."""
-        responses = ResultList()
+    def get_many(
+        self, url, count, *, params=None, headers=None, auth=None, results: CompactResultList = None
+    ) -> ResultList | CompactResultList:
+        """
+        Send multiple `GET` requests.
+        :param results: Container to store the Results into, e.g. CompactResultList for large amount of requests
+        """
+        responses = ResultList() if results is None else results
+        responses.extend(self.iter_many(url, count, params=params, headers=headers, auth=auth))
+        return responses
+
+    def iter_many(
+        self, url, count, *, params=None, headers=None, auth=None, stop_when: Callable[[Result], bool] = None
+    ) -> Iterator[Result]:
+        """
+        Lazily send up to `count` `GET` requests, yielding each Result as soon as it is received.
+        :param stop_when: Predicate, no more requests are sent after the first Result it matched (which is yielded)
+            e.g. `stop_when=lambda result: result.status_code == 429`
+        """
         for _ in range(count):
-            responses.append(self.get(url, params=params, headers=headers, auth=auth))
+            result = self.get(url, params=params, headers=headers, auth=auth)
+            yield result
+            if stop_when is not None and stop_when(result):
+                return
+
+    def multiplex(self, url, count, *, params=None, headers=None, auth=None, concurrency: int = 100) -> ResultList:
+        """
+        Send a burst of `GET` requests multiplexed as concurrent streams over a single HTTP/2 connection.
+        The first request opens the connection, the rest of them are sent at once, at most `concurrency` in flight.
+        Latency of each stream is in `Result.latency`, its stream id in `Result.extensions["stream_id"]`.
+        Requests are not retried, so latency of every stream covers exactly one attempt.
+        Raises ValueError if the server does not agree to HTTP/2, e.g. for `http://` URLs, as h2c is not negotiated.
+        """
+        if not self.http2:
+            raise ValueError("Multiplexing requires client with HTTP/2 enabled, create it with `http2=True`")
+        if count == 0:
+            return ResultList()
+
+        first = self.send_once("GET", url, params=params, headers=headers, auth=auth)
+        if first.response is not None and first.response.http_version != "HTTP/2":
+            raise ValueError(f"Server responded with {first.response.http_version}, multiplexing requires HTTP/2")
+        responses = ResultList([first])
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            responses.extend(
+                executor.map(
+                    lambda _: self.send_once("GET", url, params=params, headers=headers, auth=auth), range(count - 1)
+                )
+            )
+        return responses
+
+
+class AsyncKuadrantClient(_ResultClient, AsyncClient):
+    """Asynchronous counterpart of KuadrantClient, which is able to send multiple requests concurrently"""
+
+    def __init__(
+        self,
+        *,
+        verify: Union[Certificate, bool] = True,
+        cert: Certificate = None,
+        retry_codes: Iterable[int] = None,
+        concurrency: int = 10,
+        retry_policy: RetryPolicy = None,
+        correlate_requests: bool = False,
+        traffic_log: TrafficLog = None,
+        **kwargs,
+    ):
+        """
+        :param concurrency: Default maximum number of requests in flight in `get_many`
+        :param retry_policy: Decides which unstable requests are retried, by default clients share one per host
+        :param correlate_requests: Send unique `x-request-id` and `traceparent` headers with each request
+        :param traffic_log: Aggregates Results of all requests, instead of logging each of them
+        """
+        self.concurrency = concurrency
+        super().__init__(
+            retry_codes,
+            retry_policy,
+            correlate_requests,
+            traffic_log,
+            verify=ssl_context(verify, cert, kwargs.get("http2", False)),
+            **kwargs,
+        )
+
+    async def request(self, method: str, url, **kwargs) -> Result:
+        """Sends the request and retries it according to the RetryPolicy, while it is unstable"""
+        attempts = self.retry_policy.begin(self._merge_url(url).host, self._retry_metrics)
+        while True:
+            result = await self._request(method, url, **kwargs)
+            delay = attempts.next_delay(result.should_backoff())
+            if delay is None:
+                return self._record(result, method, self._merge_url(url))
+            await asyncio.sleep(delay)
+
+    async def send_once(self, method: str, url, **kwargs) -> Result:
+        """Sends the request without any retries, e.g. under load, where backoff sleeps would skew the measurements"""
+        return self._record(await self._request(method, url, **kwargs), method, self._merge_url(url))
+
+    async def _request(
+        self,
+        method: str,
+        url,
+        *,
+        headers=None,
+        auth=None,
+        follow_redirects=None,
+        timeout=None,
+        extensions=None,
+        **kwargs,
+    ) -> Result:
+        headers, extensions, correlation = self._prepare(headers, extensions, AsyncPhaseTracer)
+        started, start = time.time(), time.perf_counter()
+        try:
+            response = await super().request(
+                method,
+                url,
+                headers=headers,
+                auth=auth,
+                follow_redirects=follow_redirects,
+                timeout=timeout,
+                extensions=extensions,
+                **kwargs,
+            )
+        except RequestError as e:
+            return self._result(started, start, extensions, correlation, error=e)
+        return self._result(started, start, extensions, correlation, response=response)
 
+    async def get(self, *args, **kwargs) -> Result:
+        return await super().get(*args, **kwargs)
+
+    async def get_many(
+        self,
+        url,
+        count,
+        *,
+        params=None,
+        headers=None,
+        auth=None,
+        concurrency: int = None,
+        results: CompactResultList = None,
+    ) -> ResultList | CompactResultList:
+        """
+        Send multiple `GET` requests concurrently, at most `concurrency` of them are in flight at any time.
+        Results are stored as soon as they are received, i.e. in the order the requests completed.
+        :param results: Container to store the Results into, e.g. CompactResultList for large amount of requests
+        """
+        responses = ResultList() if results is None else results
+        remaining = iter(range(count))
+
+        async def _worker():
+            for _ in remaining:
+                responses.append(await self.get(url, params=params, headers=headers, auth=auth))
+
+        await asyncio.gather(*(_worker() for _ in range(min(concurrency or self.concurrency, count))))
         return responses
 
 
@@ -0,0 +1,118 @@
+"""Bursts of truly simultaneous requests for testing counters under contention"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional, TYPE_CHECKING
+
+from httpx import RequestError
+
+from testsuite.httpx import KuadrantClient, RateLimitCounts, Result, ResultList
+from testsuite.httpx.timing import PhaseTracer
+
+if TYPE_CHECKING:
+    from testsuite.kuadrant.policy.rate_limit import Limit
+
+
+@dataclass
+class BurstResult(RateLimitCounts):
+    """
+    Results of a single burst
+    :param released: perf_counter() values of the moments each request was released by the barrier
+    """
+
+    limit: Optional["Limit"]
+    results: ResultList = field(default_factory=ResultList)
+    released: list[float] = field(default_factory=list)
+
+    @property
+    def spread(self) -> float:
+        """Time in seconds between the first and the last request leaving the barrier"""
+        return max(self.released) - min(self.released) if self.released else 0.0
+
+    @property
+    def over_admitted(self) -> int:
+        """Number of requests allowed above the limit, i.e. admitted due to a race on the counter"""
+        if self.limit is None:
+            return 0
+        return max(0, self.allowed - self.limit.limit)
+
+    def assert_admitted(self):
+        """Asserts that exactly as many requests as the limit allows were admitted"""
+        assert self.limit is not None, "Burst was not sent with any Limit to compare to"
+        expected = min(self.limit.limit, len(self.results))
+        assert self.allowed == expected, (
+            f"{self.allowed} out of {len(self.results)} simultaneous requests were allowed, expected {expected} "
+            f"(over-admitted {self.over_admitted}, send spread {self.spread * 1000:.3f}ms)"
+        )
+
+    def __str__(self):
+        return (
+            f"BurstResult[size={len(self.results)}, allowed={self.allowed}, rejected={self.rejected}, "
+            f"over_admitted={self.over_admitted}, spread={self.spread * 1000:.3f}ms]"
+        )
+
+
+class BarrierBurst:
+    """
+    Sends `size` requests at the same moment, each from its own thread and client (and therefore connection).
+    Connections are opened and requests are built before all threads are released by a barrier at once,
+    so only sending of the already built request remains. Requests are not retried.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], KuadrantClient],
+        size: int,
+        warmup_url: str,
+        timeout: float = 30,
+    ):
+        """
+        :param client_factory: Creates a client for each thread, it should not share connections with other clients,
+            e.g. `functools.partial(hostname.client, shared_transport=False)`
+        :param warmup_url: Path which is requested by each client before the burst to open the connection,
+            so TCP and TLS handshakes do not add to the spread, it should not be counted by the tested limit
+        :param timeout: Maximum time in seconds to wait for all clients to get ready
+        """
+        self.client_factory = client_factory
+        self.size = size
+        self.warmup_url = warmup_url
+        self.timeout = timeout
+
+    def _send(self, barrier: threading.Barrier, method: str, url: str, kwargs: dict) -> tuple[Result, float]:
+        with self.client_factory() as client:
+            try:
+                client.get(self.warmup_url)
+                tracer = PhaseTracer()
+                request = client.build_request(method, url, extensions={"trace": tracer}, **kwargs)
+            except Exception:
+                # Do not let the other threads wait for this one until the timeout
+                barrier.abort()
+                raise
+            barrier.wait(self.timeout)
+            released = time.perf_counter()
+            started = time.time()
+            try:
+                response = client.send(request)
+                result = Result(client.retry_codes, response=response, started=started, timings=tracer.timings)
+            except RequestError as e:
+                result = Result(client.retry_codes, error=e, started=started, timings=tracer.timings)
+            result.latency = time.perf_counter() - released
+            return result, released
+
+    def run(self, url: str, limit: "Limit" = None, method: str = "GET", **kwargs) -> BurstResult:
+        """
+        Sends the burst and returns its results
+        :param limit: Limit expected to apply to the burst, used to compute over-admitted requests
+        kwargs are passed to `client.build_request`, e.g. headers or params
+        """
+        barrier = threading.Barrier(self.size)
+        burst = BurstResult(limit)
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._send, barrier, method, url, kwargs) for _ in range(self.size)]
+            for future in futures:
+                result, released = future.result()
+                burst.results.append(result)
+                burst.released.append(released)
+        return burst
@@ -0,0 +1,189 @@
+"""Recording of HTTP traffic into cassettes, which can be replayed later without a live gateway"""
+
+import base64
+import json
+import socket
+import ssl
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Union, Optional, TextIO
+
+import httpx
+from httpx import BaseTransport, ByteStream, Request, Response
+
+from testsuite.httpx.errors import causes
+
+# Low-level exceptions which decide the ErrorCategory, they are stored with the error to be chained to it on replay
+CAUSES = {cls.__name__: cls for cls in (socket.gaierror, ssl.SSLError, ssl.SSLCertVerificationError, ssl.SSLEOFError)}
+
+
+def _cause(error: Exception) -> Optional[list]:
+    """Returns [class name, errno, message, ssl reason] of the first stored kind of cause of the error"""
+    for cause in causes(error):
+        if isinstance(cause, OSError) and type(cause).__name__ in CAUSES:
+            return [type(cause).__name__, cause.errno, cause.strerror, getattr(cause, "reason", None)]
+    return None
+
+
+def _restore(cause: list) -> Exception:
+    """Returns the exception described by `_cause`"""
+    name, errno, message, reason = cause
+    error = CAUSES[name](errno, message)
+    if reason is not None:
+        error.reason = reason  # type: ignore[union-attr]
+    return error
+
+
+class CassetteError(Exception):
+    """Request could not be replayed from the cassette"""
+
+
+class Cassette:
+    """
+    Request/response pairs stored in JSON Lines file.
+    Each header (name and value) is stored only once and interactions reference it by its id,
+    so headers which change with every response (e.g. `date`) do not prevent sharing of the others.
+    Lines are either header definitions `{"p": id, "header": [name, value]}`
+    or interactions `{"m": method, "u": url, "s": status, "h": [header ids], "b": body}`,
+    or `{"m": method, "u": url, "err": error class, "msg": message, "cause": [...]}` for requests which failed,
+    where the optional cause describes the DNS or TLS error which decides the ErrorCategory.
+    Replayed responses for the same method and url are returned in the recorded order.
+    """
+
+    def __init__(self, path: Union[Path, str], record: bool = False):
+        """
+        :param record: Record new cassette (overwriting existing one), otherwise replay the existing one
+        """
+        self.path = Path(path)
+        self.record = record
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+        self._header_ids: dict[tuple[str, str], int] = {}
+        self._headers: dict[int, tuple[str, str]] = {}
+        self._interactions: dict[tuple[str, str], deque] = defaultdict(deque)
+        if record:
+            self.path.write_text("", encoding="utf-8")
+        else:
+            self._load()
+
+    def _load(self):
+        with self.path.open(encoding="utf-8") as file:
+            for line in file:
+                entry = json.loads(line)
+                if "header" in entry:
+                    self._headers[entry["p"]] = tuple(entry["header"])
+                else:
+                    self._interactions[(entry["m"], entry["u"])].append(entry)
+
+    def _write(self, entry: dict):
+        if self._file is None:
+            # Cassette can be shared by multiple clients, which close it one by one, so the file is only appended to
+            self._file = self.path.open("a", encoding="utf-8")  # pylint: disable=consider-using-with
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _header_ids_of(self, headers: httpx.Headers) -> list[int]:
+        """Returns ids of the headers, writes definitions of headers which were not seen yet"""
+        ids = []
+        for header in headers.multi_items():
+            if header not in self._header_ids:
+                self._header_ids[header] = len(self._header_ids)
+                self._write({"p": self._header_ids[header], "header": list(header)})
+            ids.append(self._header_ids[header])
+        return ids
+
+    def add(self, request: Request, response: Optional[Response] = None, raw: bytes = b"", error=None):
+        """Records a single interaction"""
+        entry: dict = {"m": request.method, "u": str(request.url)}
+        with self._lock:
+            if response is None:
+                entry.update({"err": type(error).__name__, "msg": str(error)})
+                if (cause := _cause(error)) is not None:
+                    entry["cause"] = cause
+            else:
+                try:
+                    entry.update({"s": response.status_code, "h": self._header_ids_of(response.headers)})
+                    entry["b"] = raw.decode("utf-8")
+                except UnicodeDecodeError:
+                    entry["b64"] = base64.b64encode(raw).decode("ascii")
+            self._write(entry)
+
+    def replay(self, request: Request) -> Response:
+        """Returns next recorded response for the request"""
+        with self._lock:
+            recorded = self._interactions.get((request.method, str(request.url)))
+            if not recorded:
+                raise CassetteError(f"No recorded response left for {request.method} {request.url} in {self.path}")
+            entry = recorded.popleft()
+        if "err" in entry:
+            error = getattr(httpx, entry["err"], httpx.RequestError)(entry["msg"], request=request)
+            raise error from (_restore(entry["cause"]) if "cause" in entry else None)
+        raw = base64.b64decode(entry["b64"]) if "b64" in entry else entry["b"].encode("utf-8")
+        return Response(
+            entry["s"],
+            headers=[self._headers[header_id] for header_id in entry["h"]],
+            stream=ByteStream(raw),
+            request=request,
+            extensions={"http_version": b"HTTP/1.1"},
+        )
+
+    def remaining(self, request: Request) -> int:
+        """Returns number of recorded responses for the request, which were not replayed yet"""
+        with self._lock:
+            return len(self._interactions.get((request.method, str(request.url)), ()))
+
+    def transport(self, transport: BaseTransport) -> BaseTransport:
+        """Returns transport which records traffic sent through `transport` or replays it"""
+        return RecordingTransport(self, transport) if self.record else ReplayTransport(self)
+
+    def close(self):
+        """Flushes recorded interactions"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingTransport(BaseTransport):
+    """Transport which records all traffic going through it into a Cassette"""
+
+    def __init__(self, cassette: Cassette, transport: BaseTransport):
+        self.cassette = cassette
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        try:
+            response = self.transport.handle_request(request)
+        except httpx.RequestError as error:
+            self.cassette.add(request, error=error)
+            raise
+        if response.is_stream_consumed:
+            # Transports like httpx.MockTransport return responses, which were already read
+            raw = response.content
+        else:
+            try:
+                raw = b"".join(response.iter_raw())
+            finally:
+                response.close()
+        self.cassette.add(request, response, raw)
+        return Response(
+            response.status_code,
+            headers=response.headers,
+            stream=ByteStream(raw),
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.transport.close()
+        self.cassette.close()
+
+
+class ReplayTransport(BaseTransport):
+    """Transport which answers requests from a Cassette, without any network traffic"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def handle_request(self, request: Request) -> Response:
+        return self.cassette.replay(request)
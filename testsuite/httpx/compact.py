@@ -0,0 +1,154 @@
+"""Memory efficient storage for large amount of Results"""
+
+import math
+from array import array
+from typing import Iterable, Optional, Iterator
+
+import numpy as np
+
+from testsuite.httpx.errors import ErrorCategory
+from testsuite.httpx.expectations import Expectations
+from testsuite.httpx.stats import ResultSummary, summarize
+
+
+class CompactResult:
+    """Read-only view on a single request stored in CompactResultList"""
+
+    __slots__ = ("status_code", "latency", "started", "error_category", "headers", "body")
+
+    def __init__(
+        self,
+        status_code: Optional[int],
+        latency: float,
+        started: float,
+        error_category: ErrorCategory,
+        headers: dict[str, Optional[str]],
+        body: Optional[bytes],
+    ):
+        self.status_code = status_code
+        self.latency = latency
+        self.started = started
+        self.error_category = error_category
+        self.headers = headers
+        self.body = body
+
+    def __str__(self):
+        if self.error_category == ErrorCategory.NONE:
+            return f"CompactResult[status_code={self.status_code}]"
+        return f"CompactResult[error={self.error_category.name}]"
+
+
+class _Column:
+    """Column of string values stored as indexes into a table of unique values"""
+
+    def __init__(self):
+        self.values: list[Optional[str]] = [None]
+        self.index: dict[str, int] = {}
+        self.codes = array("I")
+
+    def append(self, value: Optional[str]):
+        """Adds a value to the end of the column"""
+        if value is None:
+            self.codes.append(0)
+            return
+        if value not in self.index:
+            self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(self.index[value])
+
+    def __getitem__(self, item: int) -> Optional[str]:
+        return self.values[self.codes[item]]
+
+
+class CompactResultList(Expectations):  # pylint: disable=too-many-instance-attributes
+    """
+    Columnar alternative to ResultList for long-running traffic, which does not keep the whole responses.
+    Only status codes, latencies, error categories and selected headers are stored in typed arrays,
+    response bodies are dropped unless `body_sample_rate` asks to keep some of them.
+    Items are returned as CompactResult, which supports the same attributes used by ResultList assertions.
+    """
+
+    def __init__(self, headers: Iterable[str] = (), body_sample_rate: float = 0.0):
+        """
+        :param headers: Names of response headers to keep
+        :param body_sample_rate: Fraction (0.0 - 1.0) of response bodies to keep, evenly spread over the requests
+        """
+        self.header_names = [name.lower() for name in headers]
+        self.body_sample_rate = body_sample_rate
+        self.status_codes = array("H")
+        self.latencies = array("d")
+        self.started = array("d")
+        self.error_categories = array("B")
+        self.header_columns = {name: _Column() for name in self.header_names}
+        self.bodies: dict[int, bytes] = {}
+
+    def _sample_body(self, index: int) -> bool:
+        """Decides whether to keep body, keeps exactly `body_sample_rate` of bodies in any prefix of the list"""
+        return math.floor((index + 1) * self.body_sample_rate) > math.floor(index * self.body_sample_rate)
+
+    def append(self, result):
+        """Stores the important parts of Result, the Result itself is not referenced afterward"""
+        index = len(self)
+        response = result.response
+        self.status_codes.append(0 if response is None else response.status_code)
+        self.latencies.append(math.nan if result.latency is None else result.latency)
+        self.started.append(math.nan if result.started is None else result.started)
+        self.error_categories.append(result.error_category)
+        for name, column in self.header_columns.items():
+            column.append(None if response is None else response.headers.get(name))
+        if response is not None and self._sample_body(index):
+            self.bodies[index] = response.content
+
+    def extend(self, results: Iterable):
+        """Stores all the Results"""
+        for result in results:
+            self.append(result)
+
+    def merge(self, other: "CompactResultList"):
+        """Appends all requests stored in other CompactResultList, only headers kept by this list are merged"""
+        offset = len(self)
+        self.status_codes.extend(other.status_codes)
+        self.latencies.extend(other.latencies)
+        self.started.extend(other.started)
+        self.error_categories.extend(other.error_categories)
+        for name, column in self.header_columns.items():
+            if name in other.header_columns:
+                values = other.header_columns[name].values
+                for code in other.header_columns[name].codes:
+                    column.append(values[code])
+            else:
+                for _ in range(len(other)):
+                    column.append(None)
+        self.bodies.update({index + offset: body for index, body in other.bodies.items()})
+
+    def __len__(self):
+        return len(self.status_codes)
+
+    def __getitem__(self, item: int) -> CompactResult:
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("CompactResultList index out of range")
+        error_category = ErrorCategory(self.error_categories[item])
+        return CompactResult(
+            self.status_codes[item] if error_category == ErrorCategory.NONE else None,
+            self.latencies[item],
+            self.started[item],
+            error_category,
+            {name: column[item] for name, column in self.header_columns.items() if column[item] is not None},
+            self.bodies.get(item),
+        )
+
+    def __iter__(self) -> Iterator[CompactResult]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def summary(self, window: float = 1.0) -> ResultSummary:
+        """Returns latency, status code and throughput statistics, throughput is computed in `window` seconds"""
+        return summarize(
+            np.frombuffer(self.status_codes, dtype=np.uint16),
+            np.frombuffer(self.latencies, dtype=np.float64),
+            np.frombuffer(self.started, dtype=np.float64),
+            np.frombuffer(self.error_categories, dtype=np.uint8),
+            window,
+        )
@@ -0,0 +1,43 @@
+"""Correlation of requests with traces and logs of the gateway and Kuadrant components"""
+
+import secrets
+import uuid
+from dataclasses import dataclass
+
+from httpx import Headers
+
+
+@dataclass(frozen=True)
+class Correlation:
+    """
+    Identifiers sent with a single request
+    :param request_id: Value of the `x-request-id` header, Authorino reports it as `authorino.request_id`
+    :param trace_id: W3C trace id sent in the `traceparent` header, the request is traced as part of this trace
+    :param span_id: W3C parent span id sent in the `traceparent` header
+    """
+
+    request_id: str
+    trace_id: str
+    span_id: str
+
+    @classmethod
+    def generate(cls, request_id: str = None) -> "Correlation":
+        """Generates new unique identifiers"""
+        return cls(request_id or str(uuid.uuid4()), secrets.token_hex(16), secrets.token_hex(8))
+
+    @property
+    def traceparent(self) -> str:
+        """Returns value of the W3C `traceparent` header with the sampled flag set"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def correlate(headers=None) -> tuple[Headers, Correlation]:
+    """
+    Adds unique `x-request-id` and `traceparent` to the request headers,
+    `x-request-id` already present in headers is kept
+    """
+    headers = Headers(headers)
+    correlation = Correlation.generate(headers.get("x-request-id"))
+    headers["x-request-id"] = correlation.request_id
+    headers["traceparent"] = correlation.traceparent
+    return headers, correlation
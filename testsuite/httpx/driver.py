@@ -0,0 +1,91 @@
+"""Multi-process load driver, which is not limited by the GIL of a single process"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from testsuite.httpx import KuadrantClient
+from testsuite.httpx.compact import CompactResultList
+
+
+@dataclass
+class RequestPlan:
+    """Description of requests, which should be sent by the driver"""
+
+    url: str
+    count: int
+    method: str = "GET"
+    headers: dict[str, str] = field(default_factory=dict)
+    params: dict[str, str] = field(default_factory=dict)
+
+    def split(self, parts: int) -> list["RequestPlan"]:
+        """Splits the plan into (at most) `parts` plans with the same total count of requests"""
+        size, remainder = divmod(self.count, parts)
+        counts = [size + 1 if i < remainder else size for i in range(parts)]
+        return [RequestPlan(self.url, count, self.method, self.headers, self.params) for count in counts if count > 0]
+
+
+def _run_worker(
+    client_factory: Callable[[], KuadrantClient],
+    plan: RequestPlan,
+    threads: int,
+    headers: Iterable[str],
+    body_sample_rate: float,
+) -> CompactResultList:
+    """Sends all requests from the plan in a worker process and returns compact results"""
+    results = CompactResultList(headers, body_sample_rate)
+    with client_factory() as client, ThreadPoolExecutor(max_workers=threads) as executor:
+        results.extend(
+            executor.map(
+                lambda _: client.send_once(plan.method, plan.url, headers=plan.headers, params=plan.params),
+                range(plan.count),
+            )
+        )
+    return results
+
+
+class ProcessPoolDriver:
+    """
+    Fans a RequestPlan out to worker processes, each of them owns its own KuadrantClient.
+    Results of the workers are merged back into a single CompactResultList, so `summary()` covers the whole run.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], KuadrantClient],
+        workers: int = None,
+        threads: int = 1,
+        headers: Iterable[str] = (),
+        body_sample_rate: float = 0.0,
+    ):
+        """
+        :param client_factory: Picklable callable creating client in a worker,
+            e.g. `functools.partial(KuadrantClient, base_url=..., verify=...)`
+        :param workers: Number of worker processes, number of CPUs by default
+        :param threads: Number of threads sending requests in each worker
+        :param headers: Response headers to keep in results
+        :param body_sample_rate: Fraction of response bodies to keep in results
+        """
+        self.client_factory = client_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.headers = list(headers)
+        self.body_sample_rate = body_sample_rate
+
+    def run(self, plan: RequestPlan) -> CompactResultList:
+        """Sends all requests from the plan and returns merged results"""
+        results = CompactResultList(self.headers, self.body_sample_rate)
+        # Forking a process with running threads (e.g. from connection pools) is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    _run_worker, self.client_factory, part, self.threads, self.headers, self.body_sample_rate
+                )
+                for part in plan.split(self.workers)
+            ]
+            for future in futures:
+                results.merge(future.result())
+        return results
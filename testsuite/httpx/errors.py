@@ -0,0 +1,70 @@
+"""Categories of errors which can happen while sending HTTP requests"""
+
+import enum
+import socket
+import ssl
+from typing import Iterator, Optional
+
+from httpx import RemoteProtocolError, TimeoutException
+
+
+class ErrorCategory(enum.IntEnum):
+    """Category of an error which prevented the request from getting a response"""
+
+    NONE = 0
+    DNS = 1
+    TIMEOUT = 2
+    DISCONNECTED = 3
+    TLS_EOF = 4
+    CERT_VERIFY = 5
+    UNKNOWN_CA = 6
+    CERT_REQUIRED = 7
+    OTHER = 8
+
+    @property
+    def retryable(self) -> bool:
+        """True, if the error is considered an instability and the request should be retried"""
+        return self in RETRYABLE
+
+
+RETRYABLE = {ErrorCategory.DNS, ErrorCategory.TIMEOUT, ErrorCategory.DISCONNECTED, ErrorCategory.TLS_EOF}
+
+
+# Exception types in the chain of causes and their categories, the first match decides
+ERROR_TYPES: list[tuple[type | tuple[type, ...], ErrorCategory]] = [
+    ((TimeoutException, TimeoutError), ErrorCategory.TIMEOUT),
+    (socket.gaierror, ErrorCategory.DNS),
+    (ssl.SSLCertVerificationError, ErrorCategory.CERT_VERIFY),
+    (RemoteProtocolError, ErrorCategory.DISCONNECTED),
+]
+
+# Reasons of other ssl.SSLErrors, which have their own category
+SSL_REASONS = {
+    "UNEXPECTED_EOF_WHILE_READING": ErrorCategory.TLS_EOF,
+    "CERTIFICATE_VERIFY_FAILED": ErrorCategory.CERT_VERIFY,
+    "TLSV1_ALERT_UNKNOWN_CA": ErrorCategory.UNKNOWN_CA,
+    "TLSV13_ALERT_CERTIFICATE_REQUIRED": ErrorCategory.CERT_REQUIRED,
+}
+
+
+def causes(error: BaseException) -> Iterator[BaseException]:
+    """Yields the error and all exceptions that led to it, httpx and httpcore chain them through `__cause__`"""
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def categorize(error: Optional[BaseException]) -> ErrorCategory:
+    """Returns category of the error based on its type and the types of its causes, NONE means there was no error"""
+    if error is None:
+        return ErrorCategory.NONE
+    for cause in causes(error):
+        for types, category in ERROR_TYPES:
+            if isinstance(cause, types):
+                return category
+        if isinstance(cause, ssl.SSLError):
+            return SSL_REASONS.get(getattr(cause, "reason", None) or "", ErrorCategory.OTHER)
+    return ErrorCategory.OTHER
@@ -0,0 +1,192 @@
+"""Expectations about status codes of many requests, checked in a single pass over the results"""
+
+import abc
+import itertools
+from typing import Iterable, Optional, Sequence, TYPE_CHECKING
+
+from testsuite.httpx.errors import ErrorCategory
+
+if TYPE_CHECKING:
+    from testsuite.kuadrant.policy.rate_limit import Limit
+
+
+def status_of(result) -> Optional[int]:
+    """Returns status code of Result or CompactResult, None if the request failed with an error"""
+    if result.error_category != ErrorCategory.NONE:
+        return None
+    return result.status_code
+
+
+def run_length(runs: Iterable[Sequence], limit: int = 20) -> str:
+    """
+    Returns compact text of (status, count) runs, e.g. `200x5, 429x95`, errors are shown as `ERR`.
+    At most `limit` runs are shown.
+    """
+    texts = [f"{'ERR' if status is None else status}x{size}" for status, size in runs]
+    if len(texts) > limit:
+        texts = texts[:limit] + [f"... {len(texts) - limit} more runs"]
+    return ", ".join(texts)
+
+
+class Expectation(abc.ABC):
+    """Expectation which is fed with results one by one and then verified"""
+
+    @abc.abstractmethod
+    def feed(self, index: int, status: Optional[int], result):
+        """Processes next result, `status` is its status code or None if it failed with an error"""
+
+    @abc.abstractmethod
+    def verify(self, count: int) -> Optional[str]:
+        """Returns description of the failure, None if the expectation holds for `count` results"""
+
+
+class AllEqual(Expectation):
+    """All requests ended with `status_code`"""
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.first_failure: Optional[tuple[int, str]] = None
+
+    def feed(self, index, status, result):
+        if self.first_failure is None and status != self.status_code:
+            self.first_failure = (index, str(result))
+
+    def verify(self, count):
+        if self.first_failure is None:
+            return None
+        index, result = self.first_failure
+        return (
+            f"Status code assertion failed for request {index + 1} out of {count} requests: "
+            f"{result} != {self.status_code}"
+        )
+
+
+class StatusSequence(Expectation):
+    """
+    Status codes follow the given runs, e.g. `StatusSequence([(200, 5), (429, None)])`
+    means the first 5 requests ended with 200 and all the remaining ones with 429
+    """
+
+    def __init__(self, runs: Sequence[tuple[int, Optional[int]]]):
+        """:param runs: Pairs of status code and number of requests, None as a number of requests means the rest"""
+        self.runs = list(runs)
+        self._expected = [status for status, _ in self.runs]
+        self._boundaries = list(itertools.accumulate(float("inf") if size is None else size for _, size in self.runs))
+        self._required = sum(size or 0 for _, size in self.runs)
+        self.first_failure: Optional[int] = None
+
+    def _expected_at(self, index: int) -> Optional[int]:
+        for status, boundary in zip(self._expected, self._boundaries):
+            if index < boundary:
+                return status
+        return None
+
+    def feed(self, index, status, result):
+        if self.first_failure is None and status != self._expected_at(index):
+            self.first_failure = index
+
+    def verify(self, count):
+        if self.first_failure is None and count >= self._required:
+            return None
+        expected = ", ".join(f"{status}x{'rest' if size is None else size}" for status, size in self.runs)
+        if self.first_failure is None:
+            return f"Expected {expected}, but only {count} requests were sent"
+        return f"Expected {expected}, but request {self.first_failure + 1} out of {count} differs"
+
+
+class Ratio(Expectation):
+    """Fraction of requests which ended with `status_code` is within bounds"""
+
+    def __init__(self, status_code: int, at_least: float = 0.0, at_most: float = 1.0):
+        self.status_code = status_code
+        self.at_least = at_least
+        self.at_most = at_most
+        self.matched = 0
+
+    def feed(self, index, status, result):
+        if status == self.status_code:
+            self.matched += 1
+
+    def verify(self, count):
+        ratio = self.matched / count if count else 0.0
+        if self.at_least <= ratio <= self.at_most:
+            return None
+        return (
+            f"{self.matched} out of {count} requests ({ratio:.1%}) ended with {self.status_code}, "
+            f"expected between {self.at_least:.1%} and {self.at_most:.1%}"
+        )
+
+
+class WindowLimit(Expectation):
+    """
+    Number of allowed (not 429) requests in each window of the Limit is at most the limit.
+    Windows start with the first request, based on the `started` timestamps of results.
+    """
+
+    def __init__(self, limit: "Limit", rejected_status: int = 429):
+        self.limit = limit
+        self.rejected_status = rejected_status
+        self.allowed: dict[int, int] = {}
+        self._start: Optional[float] = None
+
+    def feed(self, index, status, result):
+        if status is None or status == self.rejected_status or result.started is None:
+            return
+        if self._start is None:
+            self._start = result.started
+        window = int((result.started - self._start) // self.limit.seconds)
+        self.allowed[window] = self.allowed.get(window, 0) + 1
+
+    def verify(self, count):
+        exceeded = {window: allowed for window, allowed in self.allowed.items() if allowed > self.limit.limit}
+        if not exceeded:
+            return None
+        windows = ", ".join(f"window {window}: {allowed}" for window, allowed in sorted(exceeded.items()))
+        return f"More than {self.limit.limit} requests allowed per {self.limit.seconds}s window ({windows})"
+
+
+def check(results, *expectations: Expectation) -> list[str]:
+    """Feeds all results to all expectations in a single pass, returns descriptions of failed expectations"""
+    runs: list[list] = []
+    count = 0
+    for index, result in enumerate(results):
+        status = status_of(result)
+        if runs and runs[-1][0] == status:
+            runs[-1][1] += 1
+        else:
+            runs.append([status, 1])
+        for expectation in expectations:
+            expectation.feed(index, status, result)
+        count += 1
+    failures = [failure for expectation in expectations if (failure := expectation.verify(count)) is not None]
+    if failures:
+        failures.append(f"Status codes: {run_length(runs)}")
+    return failures
+
+
+class Expectations:
+    """Assertions shared by lists of results"""
+
+    def expect(self, *expectations: Expectation):
+        """Asserts that all expectations hold, checking all of them in a single pass"""
+        failures = check(self, *expectations)
+        assert not failures, "\n".join(failures)
+
+    def assert_all(self, status_code: int):
+        """Assert all responses that contain certain status code"""
+        self.expect(AllEqual(status_code))
+
+    def assert_sequence(self, *runs: tuple[int, Optional[int]]):
+        """
+        Assert status codes follow the runs, e.g. `assert_sequence((200, 5), (429, None))`
+        for the first 5 requests ending with 200 and the rest with 429
+        """
+        self.expect(StatusSequence(runs))
+
+    def assert_ratio(self, status_code: int, at_least: float = 0.0, at_most: float = 1.0):
+        """Assert fraction of responses with the status code is within bounds"""
+        self.expect(Ratio(status_code, at_least, at_most))
+
+    def assert_window_limit(self, limit: "Limit"):
+        """Assert no more requests than the limit allows were allowed in any of its windows"""
+        self.expect(WindowLimit(limit))
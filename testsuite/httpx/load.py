@@ -0,0 +1,208 @@
+"""Open-loop load generation on top of KuadrantClient"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from testsuite.httpx import KuadrantClient, Result, ResultList
+
+
+class LatencyHistogram:
+    """
+    HdrHistogram-like latency histogram with log-linear buckets.
+    Values are recorded with microsecond resolution and every bucket keeps the relative error
+    under the configured number of significant figures, regardless of magnitude.
+    """
+
+    def __init__(self, significant_figures: int = 2):
+        self.significant_figures = significant_figures
+        # Smallest power of two which is able to represent the values with the required precision
+        self.sub_bucket_bits = (2 * 10**significant_figures - 1).bit_length()
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _bucket(self, value: int) -> int:
+        """Returns the lowest value which is equivalent to `value` in this histogram"""
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return (value >> shift) << shift
+
+    def _bucket_width(self, bucket: int) -> int:
+        """Returns the number of values which are equivalent to the `bucket`"""
+        return 1 << max(bucket.bit_length() - self.sub_bucket_bits, 0)
+
+    def record(self, seconds: float):
+        """Records single latency value in seconds"""
+        value = max(round(seconds * 1_000_000), 0)
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Adds all values recorded by other histogram into this one"""
+        for bucket, count in other.counts.items():
+            bucket = self._bucket(bucket)
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count > 0:
+            self.min = other.min if self.min is None else min(self.min, other.min)  # type: ignore
+            self.max = other.max if self.max is None else max(self.max, other.max)  # type: ignore
+
+    def percentile(self, percentile: float) -> float:
+        """Returns value in seconds under which `percentile` percent of all recorded values are"""
+        if self.count == 0:
+            raise ValueError("Unable to compute percentile of an empty histogram")
+        threshold = max(round(self.count * percentile / 100), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= threshold:
+                return min(bucket + self._bucket_width(bucket) - 1, self.max) / 1_000_000  # type: ignore
+        return self.max / 1_000_000  # type: ignore
+
+    @property
+    def mean(self) -> float:
+        """Returns mean of all recorded values in seconds"""
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """Returns list of (upper bound in seconds, count) for every non-empty bucket"""
+        return [
+            ((bucket + self._bucket_width(bucket)) / 1_000_000, self.counts[bucket]) for bucket in sorted(self.counts)
+        ]
+
+    def __str__(self):
+        if self.count == 0:
+            return "LatencyHistogram[count=0]"
+        return (
+            f"LatencyHistogram[count={self.count}, p50={self.percentile(50):.4f}s, p90={self.percentile(90):.4f}s, "
+            f"p99={self.percentile(99):.4f}s, max={self.max / 1_000_000:.4f}s]"  # type: ignore
+        )
+
+
+@dataclass
+class ScheduledRequest:
+    """
+    Single request sent by the load generator, all times are in seconds relative to the start of the run
+    :param intended: Time at which the request should have been sent according to the timetable
+    :param sent: Time at which the request was actually sent
+    :param completed: Time at which the response (or error) was received
+    """
+
+    intended: float
+    sent: float
+    completed: float
+    result: Result
+    warmup: bool = False
+
+    @property
+    def latency(self) -> float:
+        """Latency as seen by the user, measured from intended send time, free of coordinated omission"""
+        return self.completed - self.intended
+
+    @property
+    def service_time(self) -> float:
+        """Time it took the gateway to respond since the request was actually sent"""
+        return self.completed - self.sent
+
+    @property
+    def lag(self) -> float:
+        """How late was the request sent compared to the timetable"""
+        return self.sent - self.intended
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load run, warmup requests are excluded from all the statistics"""
+
+    rate: float
+    duration: float
+    requests: list[ScheduledRequest] = field(default_factory=list)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def add(self, request: ScheduledRequest):
+        """Adds request to the report"""
+        self.requests.append(request)
+        self.latency.record(request.latency)
+        self.service_time.record(request.service_time)
+        self.lag.record(request.lag)
+
+    @property
+    def results(self) -> ResultList:
+        """Returns Results of all measured requests in the order they were scheduled"""
+        return ResultList(request.result for request in self.requests)
+
+    @property
+    def achieved_rate(self) -> float:
+        """Returns real rate in which the requests were sent"""
+        if len(self.requests) < 2:
+            return 0.0
+        return (len(self.requests) - 1) / (self.requests[-1].sent - self.requests[0].sent)
+
+
+class ConstantRateLoad:
+    """
+    Open-loop load generator, which sends requests at a fixed rate according to a wall-clock timetable.
+    Unlike `get_many`, the next request is not delayed by a slow response, so the gateway slowdown
+    shows up in the measured latencies instead of silently lowering the rate (coordinated omission).
+    """
+
+    def __init__(self, client: KuadrantClient, rate: float, duration: float, warmup: float = 0, max_workers: int = 100):
+        """
+        :param client: Client used to send the requests, it needs to allow at least `max_workers` connections
+        :param rate: Requests per second
+        :param duration: Duration of the measured phase in seconds
+        :param warmup: Duration of warmup phase in seconds, requests sent during warmup are not measured
+        :param max_workers: Maximum number of requests in flight
+        """
+        self.client = client
+        self.rate = rate
+        self.duration = duration
+        self.warmup = warmup
+        self.max_workers = max_workers
+
+    def _send(self, start: float, intended: float, warmup: bool, method: str, url: str, kwargs) -> ScheduledRequest:
+        sent = time.perf_counter()
+        result = self.client.send_once(method, url, **kwargs)
+        completed = time.perf_counter()
+        return ScheduledRequest(intended - start, sent - start, completed - start, result, warmup)
+
+    def timetable(self) -> Iterable[tuple[float, bool]]:
+        """Yields intended send time (relative to start) of each request and whether it is part of warmup"""
+        warmup_count = round(self.warmup * self.rate)
+        for i in range(warmup_count + round(self.duration * self.rate)):
+            yield i / self.rate, i < warmup_count
+
+    def run(self, method: str, url: str, **kwargs) -> LoadReport:
+        """
+        Runs the load and returns report, kwargs are passed to each `client.send_once` call.
+        Requests are not retried, so unstable responses do not hold up the timetable
+        """
+        report = LoadReport(self.rate, self.duration)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            start = time.perf_counter()
+            for offset, warmup in self.timetable():
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self._send, start, start + offset, warmup, method, url, kwargs))
+
+            for future in futures:
+                request = future.result()
+                if not request.warmup:
+                    report.add(request)
+        return report
+
+    def get(self, url: str, **kwargs) -> LoadReport:
+        """Runs the load with `GET` requests"""
+        return self.run("GET", url, **kwargs)
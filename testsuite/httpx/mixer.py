@@ -0,0 +1,109 @@
+"""Traffic mixed from multiple identities, e.g. for measuring the effect of caches under realistic cardinality"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from httpx import Auth
+
+from testsuite.httpx import KuadrantClient, Result, ResultList
+from testsuite.httpx.stats import ResultSummary
+
+
+@dataclass(frozen=True)
+class Identity:
+    """
+    Identity sending requests
+    :param auth: Credentials added to requests, e.g. HeaderApiKeyAuth or HttpxOidcClientAuth
+    :param client: Client used instead of the mixer one, e.g. client presenting its own client certificate
+    """
+
+    name: str
+    auth: Optional[Auth] = None
+    client: Optional[KuadrantClient] = None
+
+
+def uniform(count: int) -> list[float]:
+    """Returns weights of `count` identities, which send the same amount of requests"""
+    return [1.0] * count
+
+
+def zipf(count: int, exponent: float = 1.0) -> list[float]:
+    """Returns weights of `count` identities, k-th identity sends requests with probability proportional to 1/k^s"""
+    return [1 / rank**exponent for rank in range(1, count + 1)]
+
+
+@dataclass
+class MixResult:
+    """
+    Results of mixed traffic
+    :param results: All Results in the order requests were scheduled
+    :param identities: Name of the identity, which sent the corresponding Result
+    """
+
+    results: ResultList = field(default_factory=ResultList)
+    identities: list[str] = field(default_factory=list)
+
+    def by_identity(self) -> dict[str, ResultList]:
+        """Returns Results of each identity"""
+        grouped: dict[str, ResultList] = {}
+        for name, result in zip(self.identities, self.results):
+            grouped.setdefault(name, ResultList()).append(result)
+        return grouped
+
+    def first(self) -> ResultList:
+        """Returns first Result of each identity, i.e. the requests which could not be served from a cache"""
+        return ResultList(results[0] for results in self.by_identity().values())
+
+    def repeated(self) -> ResultList:
+        """Returns all but the first Result of each identity, i.e. the requests which could be served from a cache"""
+        return ResultList(result for results in self.by_identity().values() for result in results[1:])
+
+    def summaries(self, window: float = 1.0) -> dict[str, ResultSummary]:
+        """Returns ResultSummary of each identity"""
+        return {name: results.summary(window) for name, results in self.by_identity().items()}
+
+
+class TrafficMixer:
+    """
+    Sends requests on behalf of a pool of identities, each request picks an identity according to weights,
+    e.g. `TrafficMixer(client, identities, zipf(len(identities)))`.
+    The schedule is generated from `seed`, so runs with the same seed send the same sequence of identities.
+    """
+
+    def __init__(
+        self,
+        client: KuadrantClient,
+        identities: Sequence[Identity],
+        weights: Sequence[float] = None,
+        seed: int = None,
+    ):
+        """:param weights: Relative weight of each identity, all identities are equally likely by default"""
+        self.client = client
+        self.identities = list(identities)
+        self.weights = list(weights) if weights is not None else uniform(len(self.identities))
+        self.seed = seed
+        if len(self.weights) != len(self.identities):
+            raise ValueError(f"Got {len(self.weights)} weights for {len(self.identities)} identities")
+
+    def schedule(self, count: int) -> list[Identity]:
+        """Returns identities for `count` requests"""
+        return random.Random(self.seed).choices(self.identities, self.weights, k=count)
+
+    def _send(self, identity: Identity, method: str, url: str, kwargs: dict) -> Result:
+        client = identity.client or self.client
+        if identity.auth is not None:
+            kwargs = {**kwargs, "auth": identity.auth}
+        return client.send_once(method, url, **kwargs)
+
+    def run(self, url: str, count: int, method: str = "GET", concurrency: int = 1, **kwargs) -> MixResult:
+        """
+        Sends `count` requests, at most `concurrency` of them in flight at any time
+        kwargs are passed to each `client.send_once` call, requests are not retried
+        """
+        schedule = self.schedule(count)
+        mix = MixResult(identities=[identity.name for identity in schedule])
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            mix.results.extend(executor.map(lambda identity: self._send(identity, method, url, kwargs), schedule))
+        return mix
@@ -0,0 +1,49 @@
+"""Large request bodies generated while they are being sent"""
+
+import hashlib
+import random
+from typing import Iterator
+
+KB = 1024
+MB = 1024 * KB
+
+
+class Payload:
+    """
+    Deterministic request body of `size` bytes, which is generated in chunks while it is sent,
+    so even bodies of hundreds of MB do not have to be held in memory.
+    All chunks are views into a single pseudo-random block derived from `seed`.
+    Payload can be iterated repeatedly, so requests with it can be retried,
+    e.g. `client.post("/post", content=payload, headers=payload.headers)`
+    """
+
+    def __init__(self, size: int, chunk_size: int = 64 * KB, seed: int = 0):
+        self.size = size
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self._block = memoryview(random.Random(seed).randbytes(min(size, chunk_size)))
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Headers which have to be sent with the payload, without them the body is sent chunked"""
+        return {"Content-Length": str(self.size), "Content-Type": "application/octet-stream"}
+
+    def __iter__(self) -> Iterator[memoryview]:
+        remaining = self.size
+        while remaining > 0:
+            chunk = self._block[: min(remaining, len(self._block))]
+            remaining -= len(chunk)
+            yield chunk
+
+    def __len__(self):
+        return self.size
+
+    def sha256(self) -> str:
+        """Returns SHA-256 digest of the whole payload, e.g. for comparing with the body received by the upstream"""
+        digest = hashlib.sha256()
+        for chunk in self:
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def __repr__(self):
+        return f"Payload[size={self.size}, seed={self.seed}]"
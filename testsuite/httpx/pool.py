@@ -0,0 +1,156 @@
+"""Connection pools shared by multiple clients"""
+
+import socket
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Union, Optional
+
+import httpx
+from httpx import BaseTransport, HTTPTransport, Request, Response
+
+from testsuite.certificates import Certificate
+from testsuite.httpx.resolver import to_address
+from testsuite.httpx.tls import ssl_context
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass
+class PoolStats:
+    """
+    Statistics of TransportPool
+    :param hits: Number of requests sent through already existing transport
+    :param misses: Number of requests which had to create a new transport
+    :param requests: Number of requests sent through all shared transports
+    :param connections: Number of connections opened by all shared transports
+    """
+
+    hits: int = 0
+    misses: int = 0
+    requests: int = 0
+    connections: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Average number of requests sent per connection, values above 1 mean keep-alive connections are reused"""
+        return self.requests / self.connections if self.connections else 0.0
+
+
+class SharedTransport(BaseTransport):
+    """Transport shared by multiple clients, closing a client does not close the underlying connections"""
+
+    def __init__(self, transport: HTTPTransport, stats: PoolStats, lock: threading.Lock):
+        self.transport = transport
+        self.stats = stats
+        self._lock = lock
+        self._seen: weakref.WeakSet = weakref.WeakSet()
+
+    def handle_request(self, request: Request) -> Response:
+        response = self.transport.handle_request(request)
+        # pylint: disable=protected-access
+        new = [connection for connection in self.transport._pool.connections if connection not in self._seen]
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.connections += len(new)
+            self._seen.update(new)
+        return response
+
+    def close(self) -> None:
+        """Connections are closed only by TransportPool.close()"""
+
+
+class PooledTransport(BaseTransport):
+    """
+    Transport of a single client, which sends every request through the shared transport of the address
+    its hostname currently resolves to, so a DNS change or a new gateway means new connections
+    """
+
+    def __init__(
+        self, pool: "TransportPool", verify: Union[Certificate, bool], cert: Optional[Certificate], http2: bool
+    ):
+        self.pool = pool
+        self.verify = verify
+        self.cert = cert
+        self.http2 = http2
+
+    def handle_request(self, request: Request) -> Response:
+        url = request.url
+        port = url.port or DEFAULT_PORTS.get(url.scheme, 80)
+        try:
+            address = self.pool.resolve(url.host, port)
+        except socket.gaierror as e:
+            # Same error as the one httpx raises, so Result.has_dns_error() works as usual
+            raise httpx.ConnectError(str(e), request=request) from e
+        sni_hostname = (request.extensions.get("sni_hostname") or url.host) if url.scheme == "https" else None
+        transport = self.pool.get(url.scheme, address, port, sni_hostname, self.verify, self.cert, self.http2)
+        return transport.handle_request(to_address(request, address))
+
+    def close(self) -> None:
+        """Connections are closed only by TransportPool.close()"""
+
+
+class TransportPool:
+    """
+    Session-wide pool of transports, so clients sending requests to the same gateway reuse keep-alive connections.
+    Transports are keyed by everything that affects the connection: scheme, resolved address, SNI and TLS material.
+    Hostnames are resolved again after `resolve_ttl` seconds, failed resolutions are not cached.
+    """
+
+    def __init__(self, resolve_ttl: float = 1.0):
+        self.resolve_ttl = resolve_ttl
+        self.transports: dict[tuple, SharedTransport] = {}
+        self.stats = PoolStats()
+        self._addresses: dict[tuple[str, int], tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def transport(
+        self, verify: Union[Certificate, bool] = True, cert: Certificate = None, http2: bool = False
+    ) -> PooledTransport:
+        """Returns transport for a client, which sends its requests through the shared transports"""
+        return PooledTransport(self, verify, cert, http2)
+
+    def resolve(self, hostname: str, port: int) -> str:
+        """Returns address the hostname resolves to, raises socket.gaierror if it does not resolve"""
+        with self._lock:
+            expires, address = self._addresses.get((hostname, port), (0.0, ""))
+        if expires > time.monotonic():
+            return address
+        address = str(socket.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)[0][4][0])
+        with self._lock:
+            self._addresses[(hostname, port)] = (time.monotonic() + self.resolve_ttl, address)
+        return address
+
+    def get(
+        self,
+        scheme: str,
+        address: str,
+        port: int,
+        sni_hostname: Optional[str],
+        verify: Union[Certificate, bool] = True,
+        cert: Certificate = None,
+        http2: bool = False,
+    ) -> SharedTransport:
+        """Returns transport for the given connection parameters, creates a new one if it does not exist yet"""
+        key = (scheme, address, port, sni_hostname, verify, cert, http2)
+        with self._lock:
+            if key in self.transports:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+                self.transports[key] = SharedTransport(
+                    HTTPTransport(verify=ssl_context(verify, cert, http2), http2=http2), self.stats, self._lock
+                )
+            return self.transports[key]
+
+    def close(self):
+        """Closes all connections"""
+        with self._lock:
+            for transport in self.transports.values():
+                transport.transport.close()
+            self.transports = {}
+            self._addresses = {}
+
+
+transport_pool = TransportPool()
@@ -0,0 +1,104 @@
+"""Resolving hostnames through specific nameservers instead of the system resolver"""
+
+import ipaddress
+import socket
+import threading
+import time
+
+import dns.exception
+import dns.resolver
+import httpx
+from httpx import BaseTransport, Request, Response
+
+
+class CachingResolver:
+    """Resolves hostnames to IPv4 addresses through given nameservers, answers are cached for their TTL"""
+
+    def __init__(self, nameservers: list[str], lifetime: float = 5.0):
+        """
+        :param nameservers: Addresses of the nameservers, e.g. nameserver of a specific geo region
+        :param lifetime: Maximum time in seconds to wait for an answer
+        """
+        self.resolver = dns.resolver.Resolver(configure=False)
+        self.resolver.nameservers = nameservers
+        self.resolver.lifetime = lifetime
+        self._cache: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, hostname: str) -> str:
+        """
+        Returns address of the hostname, IP addresses are returned as they are.
+        Raises errors of the same kind as the system resolver would, so Result.has_dns_error() works as usual.
+        """
+        try:
+            ipaddress.ip_address(hostname)
+            return hostname
+        except ValueError:
+            pass
+
+        with self._lock:
+            expires, address = self._cache.get(hostname, (0.0, ""))
+        if expires > time.time():
+            return address
+
+        try:
+            answer = self.resolver.resolve(hostname, "A")
+        except dns.resolver.NXDOMAIN as e:
+            error = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+            raise httpx.ConnectError(f"{error}: {hostname} ({e})") from error
+        except dns.resolver.NoAnswer as e:
+            error = socket.gaierror(socket.EAI_NODATA, "No address associated with hostname")
+            raise httpx.ConnectError(f"{error}: {hostname} ({e})") from error
+        except dns.exception.Timeout as e:
+            raise httpx.ConnectTimeout(f"DNS resolution of {hostname} timed out ({e})") from e
+
+        address = answer[0].address
+        with self._lock:
+            self._cache[hostname] = (answer.expiration, address)
+        return address
+
+    def clear(self):
+        """Forgets all cached answers"""
+        with self._lock:
+            self._cache = {}
+
+
+def to_address(request: Request, address: str) -> Request:
+    """Returns copy of the request sent to the address, Host header and TLS SNI still carry the original hostname"""
+    extensions = dict(request.extensions)
+    if request.url.scheme == "https" and not extensions.get("sni_hostname"):
+        extensions["sni_hostname"] = request.url.host
+    return Request(
+        request.method,
+        request.url.copy_with(host=address),
+        headers=request.headers,
+        stream=request.stream,
+        extensions=extensions,
+    )
+
+
+class ResolvingTransport(BaseTransport):
+    """
+    Transport which sends requests to the address resolved by CachingResolver.
+    The Host header and TLS SNI still carry the original hostname, so the gateway sees no difference.
+    Connections are pooled by the resolved address, so one transport should serve hostnames of a single gateway.
+    """
+
+    def __init__(self, transport: BaseTransport, resolver: CachingResolver):
+        self.transport = transport
+        self.resolver = resolver
+
+    def handle_request(self, request: Request) -> Response:
+        hostname = request.url.host
+        try:
+            address = self.resolver.resolve(hostname)
+        except httpx.RequestError as e:
+            e.request = request
+            raise
+        if address == hostname:
+            return self.transport.handle_request(request)
+
+        return self.transport.handle_request(to_address(request, address))
+
+    def close(self) -> None:
+        self.transport.close()
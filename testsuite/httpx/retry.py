@@ -0,0 +1,214 @@
+"""Retry budget and circuit breaker used by KuadrantClient to retry unstable requests"""
+
+import enum
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RetryMetrics:
+    """
+    Retry statistics of a client or of a whole RetryPolicy
+    :param requests: Number of requests sent, not counting retries
+    :param retries: Number of retried attempts
+    :param retry_time: Total time in seconds spent by retrying, including the retried attempts themselves
+    :param budget_exhausted: Number of requests which were not retried due to empty retry budget
+    :param short_circuited: Number of requests which were not retried due to open circuit breaker
+    :param circuit_opened: Number of times any circuit breaker opened
+    """
+
+    requests: int = 0
+    retries: int = 0
+    retry_time: float = 0.0
+    budget_exhausted: int = 0
+    short_circuited: int = 0
+    circuit_opened: int = 0
+
+
+class RetryBudget:
+    """
+    Limits number of retries to a fraction of the requests sent.
+    Every request deposits `ratio` tokens, every retry withdraws one, the balance is capped at `min_retries`
+    so retries are still possible for the first requests or after a long stable period.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 20):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.balance = float(min_retries)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Records a new request"""
+        with self._lock:
+            self.balance = min(self.balance + self.ratio, self.min_retries)
+
+    def withdraw(self) -> bool:
+        """Returns True and records a retry, if the budget allows another one"""
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class CircuitState(enum.Enum):
+    """State of the CircuitBreaker"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Stops retrying requests to a host which keeps failing.
+    After `failure_threshold` consecutive requests which stayed unstable even after retrying, the circuit opens
+    and requests are sent only once. After `reset_timeout` seconds the next request is allowed to retry again,
+    its outcome either closes the circuit or opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_retry(self) -> bool:
+        """Returns True, if the request is allowed to be retried"""
+        with self._lock:
+            if self.state == CircuitState.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+            return self.state != CircuitState.OPEN
+
+    def record(self, success: bool) -> bool:
+        """Records outcome of a request, returns True if that opened the circuit"""
+        with self._lock:
+            if success:
+                self.failures = 0
+                self.state = CircuitState.CLOSED
+                return False
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or (
+                self.state == CircuitState.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class RetryPolicy:  # pylint: disable=too-many-instance-attributes
+    """
+    Decides whether unstable requests should be retried and how long to wait before doing so.
+    Waits follow Fibonacci sequence (1, 1, 2, 3, 5, ...) and every host has its own RetryBudget and CircuitBreaker.
+    Clients share the `shared_policy()` by default, so a failing host is recognized across all of them.
+    """
+
+    def __init__(
+        self,
+        max_tries: int = 8,
+        max_time: Optional[float] = None,
+        budget_ratio: float = 0.2,
+        min_retries: int = 20,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30,
+    ):
+        """
+        :param max_tries: Maximum number of attempts for a single request
+        :param max_time: Maximum time in seconds spent by retrying a single request
+        """
+        self.max_tries = max_tries
+        self.max_time = max_time
+        self.budget_ratio = budget_ratio
+        self.min_retries = min_retries
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.metrics = RetryMetrics()
+        self.budgets: dict[str, RetryBudget] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, host: str, metrics: RetryMetrics = None) -> "RetryAttempts":
+        """
+        Starts retry tracking of a new request to the host
+        :param metrics: Statistics of the client sending the request, recorded in addition to the policy ones
+        """
+        with self._lock:
+            if host not in self.budgets:
+                self.budgets[host] = RetryBudget(self.budget_ratio, self.min_retries)
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        attempts = RetryAttempts(self, self.budgets[host], self.breakers[host], metrics)
+        attempts.record("requests")
+        self.budgets[host].deposit()
+        return attempts
+
+    def record(self, metric: str, value: float = 1, metrics: RetryMetrics = None):
+        """Increases value of the metric, also in `metrics` if given"""
+        with self._lock:
+            for target in (self.metrics, metrics) if metrics is not None else (self.metrics,):
+                setattr(target, metric, getattr(target, metric) + value)
+
+
+_shared_policy = RetryPolicy()
+
+
+def shared_policy() -> RetryPolicy:
+    """Returns RetryPolicy used by all clients which were not given their own"""
+    return _shared_policy
+
+
+class RetryAttempts:
+    """Tracks attempts of a single request"""
+
+    def __init__(self, policy: RetryPolicy, budget: RetryBudget, breaker: CircuitBreaker, metrics: RetryMetrics = None):
+        self.policy = policy
+        self.budget = budget
+        self.breaker = breaker
+        self.metrics = metrics
+        self.tries = 0
+        self.delays = (1, 1)
+        self.first_failure: Optional[float] = None
+
+    def record(self, metric: str, value: float = 1):
+        """Increases value of the metric of the policy and of the client"""
+        self.policy.record(metric, value, self.metrics)
+
+    def _finish(self, success: bool):
+        if self.breaker.record(success):
+            self.record("circuit_opened")
+        if self.first_failure is not None:
+            self.record("retry_time", time.monotonic() - self.first_failure)
+
+    def next_delay(self, unstable: bool) -> Optional[float]:
+        """Records outcome of an attempt and returns delay before the next one or None, if it should not retry"""
+        self.tries += 1
+        if not unstable:
+            self._finish(True)
+            return None
+
+        now = time.monotonic()
+        if self.first_failure is None:
+            self.first_failure = now
+        delay = self.delays[0]
+        if self.tries >= self.policy.max_tries or (
+            self.policy.max_time is not None and now + delay - self.first_failure > self.policy.max_time
+        ):
+            self._finish(False)
+            return None
+        if not self.breaker.allow_retry():
+            self.record("short_circuited")
+            self._finish(False)
+            return None
+        if not self.budget.withdraw():
+            self.record("budget_exhausted")
+            self._finish(False)
+            return None
+
+        self.record("retries")
+        self.delays = (self.delays[1], self.delays[0] + self.delays[1])
+        return delay
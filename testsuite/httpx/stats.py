@@ -0,0 +1,135 @@
+"""Summary statistics of sent requests"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from testsuite.httpx.errors import ErrorCategory
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+@dataclass
+class ResultSummary:
+    """
+    Aggregated statistics over multiple Results, all times are in seconds
+    :param percentiles: Latency percentiles, by default p50, p90, p99 and p99.9
+    :param status_codes: Number of responses for each status code, requests that failed with error are not included
+    :param errors: Number of failed requests for each error category
+    :param throughput: Pairs of (window start relative to the first request, requests per second in that window)
+    """
+
+    count: int
+    mean: float
+    stddev: float
+    percentiles: dict[float, float] = field(default_factory=dict)
+    status_codes: dict[int, int] = field(default_factory=dict)
+    errors: dict[ErrorCategory, int] = field(default_factory=dict)
+    throughput: list[tuple[float, float]] = field(default_factory=list)
+
+    def percentile(self, percentile: float) -> float:
+        """Returns latency percentile"""
+        return self.percentiles[percentile]
+
+    def ratio(self, status_code: int) -> float:
+        """Returns fraction of all requests which ended with `status_code`"""
+        return self.status_codes.get(status_code, 0) / self.count if self.count else 0.0
+
+    def __str__(self):
+        percentiles = ", ".join(f"p{key:g}={value:.4f}s" for key, value in self.percentiles.items())
+        return (
+            f"ResultSummary[count={self.count}, mean={self.mean:.4f}s, stddev={self.stddev:.4f}s, {percentiles}, "
+            f"status_codes={self.status_codes}, errors={ {key.name: value for key, value in self.errors.items()} }]"
+        )
+
+
+@dataclass
+class LatencyBreakdown:
+    """
+    Latency split into time spent in the upstream, as reported by Envoy, and the gateway overhead,
+    which is the rest of the time (Envoy filters such as ext_authz and rate limiting, and network)
+    :param count: Number of responses which reported upstream time
+    :param upstream: Percentiles of upstream time
+    :param overhead: Percentiles of gateway overhead
+    """
+
+    count: int
+    mean_upstream: float
+    mean_overhead: float
+    upstream: dict[float, float] = field(default_factory=dict)
+    overhead: dict[float, float] = field(default_factory=dict)
+
+    def __str__(self):
+        return (
+            f"LatencyBreakdown[count={self.count}, mean_upstream={self.mean_upstream:.4f}s, "
+            f"mean_overhead={self.mean_overhead:.4f}s]"
+        )
+
+
+def _distribution(values: np.ndarray, percentiles) -> tuple[float, float, dict[float, float]]:
+    """Returns mean, standard deviation and percentiles of known (not NaN) values"""
+    known = values[~np.isnan(values)]
+    if len(known) == 0:
+        return float("nan"), float("nan"), {key: float("nan") for key in percentiles}
+    return float(known.mean()), float(known.std()), dict(zip(percentiles, np.percentile(known, percentiles).tolist()))
+
+
+def _histogram(values: np.ndarray) -> dict[int, int]:
+    """Returns number of occurrences of each distinct value"""
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), counts.tolist()))
+
+
+def _throughput(started: np.ndarray, window: float) -> list[tuple[float, float]]:
+    """Returns requests per second in each `window` long interval since the first request"""
+    known = started[~np.isnan(started)]
+    if len(known) == 0:
+        return []
+    per_window = np.bincount(((known - known.min()) // window).astype(np.int64))
+    return [(float(i * window), float(value / window)) for i, value in enumerate(per_window)]
+
+
+def summarize(
+    status_codes: np.ndarray,
+    latencies: np.ndarray,
+    started: np.ndarray,
+    error_categories: np.ndarray,
+    window: float = 1.0,
+    percentiles=PERCENTILES,
+) -> ResultSummary:
+    """
+    Computes ResultSummary from per-request columns
+    :param status_codes: Status code of each request, ignored for requests which failed with error
+    :param latencies: Latency of each request, NaN if unknown
+    :param started: Unix timestamp of the moment each request was sent, NaN if unknown
+    :param error_categories: ErrorCategory of each request
+    :param window: Size of the throughput window in seconds
+    """
+    succeeded = error_categories == ErrorCategory.NONE
+    mean, stddev, values = _distribution(latencies, percentiles)
+    return ResultSummary(
+        len(status_codes),
+        mean,
+        stddev,
+        values,
+        _histogram(status_codes[succeeded]),
+        {ErrorCategory(key): value for key, value in _histogram(error_categories[~succeeded]).items()},
+        _throughput(started, window),
+    )
+
+
+def breakdown(upstream: np.ndarray, overhead: np.ndarray, percentiles=PERCENTILES) -> LatencyBreakdown:
+    """
+    Computes LatencyBreakdown from per-request columns, NaN marks requests without known upstream time
+    :param upstream: Upstream time of each request
+    :param overhead: Gateway overhead of each request
+    """
+    mean_upstream, _, upstream_percentiles = _distribution(upstream, percentiles)
+    mean_overhead, _, overhead_percentiles = _distribution(overhead, percentiles)
+    return LatencyBreakdown(
+        int((~np.isnan(upstream)).sum()),
+        mean_upstream,
+        mean_overhead,
+        upstream_percentiles,
+        overhead_percentiles,
+    )
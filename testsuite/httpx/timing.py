@@ -0,0 +1,140 @@
+"""Per-phase timing of requests collected through the httpx `trace` extension"""
+
+import time
+from dataclasses import dataclass, fields
+from typing import Optional, Callable, Iterable
+
+import numpy as np
+
+from testsuite.httpx.stats import PERCENTILES
+
+# httpcore event (without the connection/http11/http2 prefix) -> phase it belongs to
+EVENTS = {
+    "connect_tcp": "connect",
+    "start_tls": "tls",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "wait",
+    "receive_response_body": "receive",
+}
+
+
+@dataclass
+class PhaseTimings:
+    """
+    Time in seconds spent in each phase of a single request, None if the phase did not happen.
+    httpcore resolves the hostname as part of opening the TCP connection, so DNS lookup is included in `connect`.
+    Requests sent over a reused keep-alive connection have neither `connect` nor `tls`.
+    :param connect: DNS lookup and TCP handshake
+    :param tls: TLS handshake
+    :param send: Sending request headers and body
+    :param wait: Waiting for the response headers after the request was sent, i.e. processing on the server side
+    :param receive: Receiving response body
+    """
+
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    send: Optional[float] = None
+    wait: Optional[float] = None
+    receive: Optional[float] = None
+
+    @property
+    def reused_connection(self) -> bool:
+        """True, if the request did not have to open a new connection"""
+        return self.connect is None
+
+    @property
+    def ttfb(self) -> Optional[float]:
+        """Time to first byte, from the start of the request until the response headers were received"""
+        if self.wait is None:
+            return None
+        return sum(getattr(self, phase) or 0.0 for phase in ("connect", "tls", "send", "wait"))
+
+    def add(self, phase: str, duration: float):
+        """Adds duration to the phase, phases can repeat, e.g. on redirects"""
+        setattr(self, phase, (getattr(self, phase) or 0.0) + duration)
+
+
+PHASES = tuple(phase.name for phase in fields(PhaseTimings))
+
+
+class _PhaseRecorder:
+    """Collects PhaseTimings from httpcore trace events"""
+
+    def __init__(self, trace: Optional[Callable] = None):
+        """:param trace: Original trace callback, which is called for every event as well"""
+        self.timings = PhaseTimings()
+        self.trace = trace
+        self._started: dict[str, float] = {}
+
+    def record(self, event_name: str):
+        """Records time of the event named e.g. `http11.send_request_headers.started`"""
+        name, _, stage = event_name.rpartition(".")
+        event = name.partition(".")[2]
+        if event not in EVENTS:
+            return
+        if stage == "started":
+            self._started[event] = time.perf_counter()
+        elif event in self._started:
+            self.timings.add(EVENTS[event], time.perf_counter() - self._started.pop(event))
+
+
+class PhaseTracer(_PhaseRecorder):
+    """Callback for the httpx `trace` extension, which collects PhaseTimings"""
+
+    def __call__(self, event_name: str, info: dict):
+        self.record(event_name)
+        if self.trace is not None:
+            self.trace(event_name, info)
+
+
+class AsyncPhaseTracer(_PhaseRecorder):
+    """PhaseTracer for asynchronous clients, which require the trace callback to be a coroutine"""
+
+    async def __call__(self, event_name: str, info: dict):
+        self.record(event_name)
+        if self.trace is not None:
+            await self.trace(event_name, info)
+
+
+@dataclass
+class PhaseSummary:
+    """
+    Aggregated PhaseTimings of multiple requests, all times are in seconds
+    :param count: Number of requests with known timings
+    :param new_connections: Number of requests, which had to open a new connection
+    :param means: Mean duration of each phase, computed only from requests in which the phase happened
+    :param percentiles: Percentiles of each phase duration
+    """
+
+    count: int
+    new_connections: int
+    means: dict[str, float]
+    percentiles: dict[str, dict[float, float]]
+
+    @property
+    def slowest(self) -> str:
+        """Returns phase with the highest mean duration"""
+        return max(self.means, key=lambda phase: np.nan_to_num(self.means[phase], nan=-1.0))
+
+    def __str__(self):
+        phases = ", ".join(f"{phase}={mean * 1000:.2f}ms" for phase, mean in self.means.items())
+        return f"PhaseSummary[count={self.count}, new_connections={self.new_connections}, mean: {phases}]"
+
+
+def summarize_phases(timings: Iterable[Optional[PhaseTimings]], percentiles=PERCENTILES) -> PhaseSummary:
+    """Computes PhaseSummary, None timings (e.g. of requests sent by other clients) are skipped"""
+    known = [timing for timing in timings if timing is not None]
+    means = {}
+    values = {}
+    for phase in PHASES:
+        durations = np.fromiter(
+            (duration for timing in known if (duration := getattr(timing, phase)) is not None), np.float64
+        )
+        if len(durations) > 0:
+            means[phase] = float(durations.mean())
+            values[phase] = dict(zip(percentiles, np.percentile(durations, percentiles).tolist()))
+        else:
+            means[phase] = float("nan")
+            values[phase] = {key: float("nan") for key in percentiles}
+    return PhaseSummary(len(known), sum(1 for timing in known if not timing.reused_connection), means, values)
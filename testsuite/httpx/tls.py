@@ -0,0 +1,51 @@
+"""Process-wide cache of SSLContexts for clients using Certificates"""
+
+import ssl
+from functools import lru_cache
+from tempfile import NamedTemporaryFile
+from typing import Union
+
+import certifi
+
+from testsuite.certificates import Certificate
+
+
+def create_tmp_file(content: str):
+    """Creates temporary file and writes content into it"""
+    # The file is deleted once the caller closes it
+    # pylint: disable=consider-using-with
+    file = NamedTemporaryFile()
+    file.write(content.encode("utf-8"))
+    file.flush()
+    return file
+
+
+@lru_cache(maxsize=None)
+def ssl_context(
+    verify: Union[Certificate, bool] = True, cert: Certificate = None, http2: bool = False
+) -> Union[ssl.SSLContext, bool]:
+    """
+    Returns SSLContext trusting `verify` and presenting `cert`, contexts are shared by all clients in the process.
+    Trusted CA is loaded from memory, client certificate has to go through a temporary file (limitation of ssl module)
+    which is removed right after it is loaded, so it happens only once per certificate.
+    If no Certificate is used, `verify` is returned as is, so httpx can use its own defaults.
+    :param http2: Whether the context is used by HTTP/2 enabled clients, httpcore sets ALPN protocols on the context
+    """
+    if not isinstance(verify, Certificate) and cert is None:
+        return verify
+
+    if isinstance(verify, Certificate):
+        context = ssl.create_default_context(cadata=verify.chain)
+    elif verify:
+        context = ssl.create_default_context(cafile=certifi.where())
+    else:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+
+    if cert is not None:
+        with create_tmp_file(cert.chain) as cert_file, create_tmp_file(cert.key) as key_file:
+            context.load_cert_chain(cert_file.name, key_file.name)
+
+    context.set_alpn_protocols(["http/1.1", "h2"] if http2 else ["http/1.1"])
+    return context
@@ -0,0 +1,118 @@
+"""Sampled and aggregated logging of high-rate traffic"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Callable, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from testsuite.httpx import Result
+
+logger = logging.getLogger(__name__)
+
+
+def _failed(result: "Result") -> bool:
+    return result.error is not None or result.status_code >= 500
+
+
+class TrafficLog(logging.Filter):  # pylint: disable=too-many-instance-attributes
+    """
+    Replaces logging of every request by httpx with a sample of requests and periodic aggregate lines.
+    Failed requests are always logged in full.
+    Used as a context manager, which installs it as a filter of the httpx logger,
+    clients report their Results to it with `KuadrantClient(traffic_log=...)`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        interval: float = 10.0,
+        failed: Callable[["Result"], bool] = _failed,
+    ):
+        """
+        :param sample_rate: Fraction of successful requests logged by httpx
+        :param interval: Minimal time in seconds between aggregate lines
+        :param failed: Decides which Results are logged in full, by default errors and 5xx responses
+        """
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.failed = failed
+        self._lock = threading.Lock()
+        self._seen = 0
+        self._reset()
+
+    def _reset(self):
+        self._since = time.monotonic()
+        self._status_codes: Counter = Counter()
+        self._errors: Counter = Counter()
+        self._latencies: list[float] = []
+
+    def _sampled(self) -> bool:
+        """Deterministically passes `sample_rate` fraction of calls"""
+        with self._lock:
+            self._seen += 1
+            return int(self._seen * self.sample_rate) != int((self._seen - 1) * self.sample_rate)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Filters `HTTP Request: ...` lines of httpx, lines with 5xx status are kept"""
+        if not isinstance(record.msg, str) or not record.msg.startswith("HTTP Request:"):
+            return True
+        status_code = record.args[3] if isinstance(record.args, tuple) and len(record.args) > 3 else None
+        if isinstance(status_code, int) and status_code >= 500:
+            return True
+        return self._sampled()
+
+    def record(self, result: "Result", method: str = "", url=""):
+        """Adds Result to the aggregates, logs it in full if it failed"""
+        if self.failed(result):
+            logger.warning(
+                "Request %s %s failed: %s, latency=%s, timings=%s, correlation=%s",
+                method,
+                url,
+                result,
+                result.latency,
+                result.timings,
+                result.correlation,
+            )
+        with self._lock:
+            if result.error is None:
+                self._status_codes[result.status_code] += 1
+            else:
+                self._errors[result.error_category.name] += 1
+            if result.latency is not None:
+                self._latencies.append(result.latency)
+            due = time.monotonic() - self._since >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Logs aggregate line of Results recorded since the last one"""
+        with self._lock:
+            count = sum(self._status_codes.values()) + sum(self._errors.values())
+            if count == 0:
+                return
+            elapsed = time.monotonic() - self._since
+            p50, p99 = np.percentile(self._latencies, (50, 99)) if self._latencies else (float("nan"),) * 2
+            status_codes, errors = dict(self._status_codes), dict(self._errors)
+            self._reset()
+        logger.info(
+            "%d requests in %.1fs: status_codes=%s, errors=%s, p50=%.4fs, p99=%.4fs",
+            count,
+            elapsed,
+            status_codes,
+            errors,
+            p50,
+            p99,
+        )
+
+    def __enter__(self):
+        logging.getLogger("httpx").addFilter(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        logging.getLogger("httpx").removeFilter(self)
+        self.flush()
@@ -0,0 +1,115 @@
+"""Sending bursts of requests aligned to rate limit windows"""
+
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+from testsuite.httpx import KuadrantClient, RateLimitCounts, Result, ResultList
+
+if TYPE_CHECKING:
+    from testsuite.kuadrant.policy.rate_limit import Limit
+
+
+@dataclass
+class ClockSkew:
+    """
+    Estimated difference between server and local clock (server - local) in seconds.
+    The Date header has only one second resolution, so the skew is known to lie in [lower, upper].
+    """
+
+    lower: float = float("-inf")
+    upper: float = float("inf")
+
+    def add(self, result: Result):
+        """Narrows the estimate using the Date header of the response"""
+        if result.response is None or result.started is None or result.latency is None:
+            return
+        if "date" not in result.response.headers:
+            return
+        server = parsedate_to_datetime(result.response.headers["date"]).timestamp()
+        sent = result.started
+        received = result.started + result.latency
+        # Server handled the request somewhere between sending and receiving it and its clock showed [server, server+1)
+        self.lower = max(self.lower, server - received)
+        self.upper = min(self.upper, server + 1 - sent)
+
+    @property
+    def known(self) -> bool:
+        """True, if at least one response contained the Date header"""
+        return self.upper != float("inf")
+
+    @property
+    def estimate(self) -> float:
+        """Returns the most likely skew"""
+        return (self.lower + self.upper) / 2 if self.known else 0.0
+
+    @property
+    def uncertainty(self) -> float:
+        """Returns maximum error of the estimate"""
+        return (self.upper - self.lower) / 2 if self.known else 0.0
+
+
+@dataclass
+class WindowResult(RateLimitCounts):
+    """Requests sent in a single rate limit window"""
+
+    index: int
+    expected: int
+    results: ResultList = field(default_factory=ResultList)
+
+    def __str__(self):
+        return f"Window[{self.index}, expected={self.expected}, allowed={self.allowed}, rejected={self.rejected}]"
+
+
+class WindowedBursts:
+    """
+    Sends a burst of requests in each of consecutive rate limit windows, replacing sleep based waiting.
+    Limitador starts a window with the first request hitting the counter, so the next burst is fired
+    right after the window started by the previous burst expires.
+    With `aligned=True` windows are expected to start at multiples of their length on the server clock instead,
+    which is estimated from the Date response headers.
+    """
+
+    def __init__(self, client: KuadrantClient, limit: "Limit", margin: float = 0.1, aligned: bool = False):
+        """
+        :param margin: Time in seconds to wait after the expected window boundary before sending the next burst
+        """
+        self.client = client
+        self.limit = limit
+        self.margin = margin
+        self.aligned = aligned
+        self.skew = ClockSkew()
+
+    def _next_boundary(self, window_start: float) -> float:
+        """Returns local time after which the next window surely started"""
+        if not self.aligned:
+            return window_start + self.limit.seconds + self.margin
+        server_now = time.time() + self.skew.estimate
+        boundary = (server_now // self.limit.seconds + 1) * self.limit.seconds
+        return boundary - self.skew.estimate + self.skew.uncertainty + self.margin
+
+    def run(self, url: str, windows: int, burst: int = None, **kwargs) -> list[WindowResult]:
+        """
+        Sends `burst` (by default one more than the limit) `GET` requests in each of `windows` consecutive windows
+        kwargs are passed to each `client.get` call
+        """
+        burst = self.limit.limit + 1 if burst is None else burst
+        results = []
+        for index in range(windows):
+            window = WindowResult(index, min(burst, self.limit.limit))
+            window_start = time.time()
+            for i in range(burst):
+                result = self.client.get(url, **kwargs)
+                self.skew.add(result)
+                window.results.append(result)
+                if i == 0:
+                    # The counter was created by the first request, at latest when its response was received
+                    window_start = time.time()
+            results.append(window)
+
+            if index < windows - 1:
+                delay = self._next_boundary(window_start) - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+        return results
@@ -2,11 +2,10 @@
 
 import dataclasses
 
-from openshift_client import selector
-
 from testsuite.kuadrant.authorino import Authorino
 from testsuite.kubernetes import CustomResource
 from testsuite.kubernetes.deployment import Deployment
+from testsuite.kubernetes.lookup import get_object
 from testsuite.utils import asdict
 
 
@@ -25,8 +24,7 @@ class KuadrantSection:
     @property
     def deployment(self):
         """Returns Deployment object for CR"""
-        with self.context:
-            return selector("deployment", labels={"app": self.spec_name}).object(cls=Deployment)
+        return get_object(self.context, "apps/v1", "Deployment", labels={"app": self.spec_name}, cls=Deployment)
 
     def name(self):
         """Overrides `name` method from `apiobject` so it returns name of Kuadrant section"""
@@ -67,8 +65,7 @@ class AuthorinoSection(KuadrantSection, Authorino):
     @property
     def metrics_service(self):
         """Returns Authorino metrics service APIObject"""
-        with self.context:
-            return selector(f"service/{self.spec_name}-controller-metrics").object()
+        return get_object(self.context, "v1", "Service", f"{self.spec_name}-controller-metrics")
 
 
 class LimitadorSection(KuadrantSection):
@@ -77,14 +74,12 @@ class LimitadorSection(KuadrantSection):
     @property
     def deployment(self) -> Deployment:
         """Returns Deployment object for this Limitador"""
-        with self.context:
-            return selector(f"deployment/{self.name()}").object(cls=Deployment)
+        return get_object(self.context, "apps/v1", "Deployment", self.name(), cls=Deployment)
 
     @property
     def pod(self):
         """Returns Pod object for this Limitadaor"""
-        with self.context:
-            return selector("pod", labels={"app": self.name()}).object()
+        return get_object(self.context, "v1", "Pod", labels={"app": self.name()})
 
 
 class KuadrantCR(CustomResource):
@@ -4,11 +4,10 @@ import abc
 from dataclasses import dataclass
 from typing import Any, Optional, Dict, List
 
-from openshift_client import selector
-
 from testsuite.kubernetes import CustomResource
 from testsuite.kubernetes.client import KubernetesClient
 from testsuite.kubernetes.deployment import Deployment
+from testsuite.kubernetes.lookup import get_object
 from testsuite.utils import asdict
 
 
@@ -89,14 +88,12 @@ class AuthorinoCR(CustomResource, Authorino):
     @property
     def deployment(self):
         """Returns Deployment object for this Authorino"""
-        with self.context:
-            return selector(f"deployment/{self.name()}").object(cls=Deployment)
+        return get_object(self.context, "apps/v1", "Deployment", self.name(), cls=Deployment)
 
     @property
     def metrics_service(self):
         """Returns Authorino metrics service APIObject"""
-        with self.context:
-            return selector(f"service/{self.name()}-controller-metrics").object()
+        return get_object(self.context, "v1", "Service", f"{self.name()}-controller-metrics")
 
     @property
     def authorization_url(self):
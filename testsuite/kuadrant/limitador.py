@@ -1,9 +1,8 @@
 """Limitador CR object"""
 
-from openshift_client import selector
-
 from testsuite.kubernetes import CustomResource
 from testsuite.kubernetes.deployment import Deployment
+from testsuite.kubernetes.lookup import get_object
 
 
 class LimitadorCR(CustomResource):
@@ -12,11 +11,9 @@ class LimitadorCR(CustomResource):
     @property
     def deployment(self) -> Deployment:
         """Returns Deployment object for this Limitador"""
-        with self.context:
-            return selector(f"deployment/{self.name()}").object(cls=Deployment)
+        return get_object(self.context, "apps/v1", "Deployment", self.name(), cls=Deployment)
 
     @property
     def pod(self):
         """Returns Pod object for this Limitadaor"""
-        with self.context:
-            return selector("pod", labels={"app": "limitador"}).object()
+        return get_object(self.context, "v1", "Pod", labels={"app": "limitador"})
@@ -11,6 +11,8 @@ from testsuite.kuadrant.policy import Policy
 from testsuite.kuadrant.policy.authorization import Rule
 from testsuite.utils import asdict
 
+UNIT_SECONDS = {"second": 1, "minute": 60, "hour": 60 * 60, "day": 24 * 60 * 60}
+
 
 @dataclass
 class Limit:
@@ -20,6 +22,11 @@ class Limit:
     duration: int
     unit: Literal["second", "minute", "day"] = "second"
 
+    @property
+    def seconds(self) -> int:
+        """Returns length of the limit window in seconds"""
+        return self.duration * UNIT_SECONDS[self.unit]
+
 
 class RateLimitPolicy(Policy):
     """RateLimitPolicy (or RLP for short) object, used for applying rate limiting rules to a Gateway/HTTPRoute"""
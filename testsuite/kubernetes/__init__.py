@@ -2,27 +2,89 @@
 
 import dataclasses
 import functools
+import time
 from dataclasses import dataclass, field
 from typing import Optional, Literal
 
-from openshift_client import APIObject, timeout, OpenShiftPythonException
+from openshift_client import APIObject, Model, timeout, OpenShiftPythonException
 
+from testsuite.kubernetes.informer import get_informer
+from testsuite.kubernetes.rest import KubernetesRestClient, RestResult, backend_of, rest_client
 from testsuite.lifecycle import LifecycleObject
 from testsuite.utils import asdict
 
 
 class KubernetesObject(APIObject, LifecycleObject):
-    """Custom APIObjects which tracks if the object was already committed to the server or not"""
+    """
+    Custom APIObjects which tracks if the object was already committed to the server or not.
+    With `kubernetes.backend` set to `rest`, basic operations talk to the API server directly instead of using oc.
+    """
 
     def __init__(self, dict_to_model=None, string_to_model=None, context=None):
         super().__init__(dict_to_model, string_to_model, context)
         self._committed = None
 
+    @property
+    def rest(self) -> Optional[KubernetesRestClient]:
+        """Returns client of the REST backend, None if oc is used"""
+        return rest_client(self.context) if backend_of(self.context).rest else None
+
+    def _rest_args(self) -> tuple[str, str, str, Optional[str]]:
+        """Returns apiVersion, kind, name and namespace of the object"""
+        namespace = self.namespace(if_missing=None) or self.context.get_project()
+        return self.api_version(), self.kind(), self.name(), namespace
+
+    def exists(self, on_exists_func=None, on_absent_func=None):
+        """
+        Returns whether the object exists on the server, followed by return value of the function, if supplied
+        :param on_exists_func: The function to execute if the object exists
+        :param on_absent_func: The function to execute if the object does not exist
+        """
+        if (rest := self.rest) is None:
+            does_exist = self.self_selector().count_existing() == 1
+        else:
+            does_exist = rest.get(*self._rest_args()) is not None
+        func = on_exists_func if does_exist else on_absent_func
+        return does_exist, func(self) if func is not None else None
+
+    def refresh(self):
+        if (rest := self.rest) is None:
+            return super().refresh()
+        model = rest.get(*self._rest_args())
+        if model is None:
+            raise OpenShiftPythonException(f"Error refreshing object content, {self.qname()} does not exist")
+        self.model = Model(model)
+        return self
+
+    def modify_and_apply(self, modifier_func, retries=2, cmd_args=None, **kwargs):
+        if (rest := self.rest) is None:
+            return super().modify_and_apply(modifier_func, retries, cmd_args, **kwargs)
+        for attempt in reversed(range(retries + 1)):
+            if modifier_func(self, **kwargs) is False:
+                return RestResult("apply"), False
+            try:
+                self.model = Model(rest.replace(self.as_dict(), self.context.get_project()))
+                return RestResult("apply"), True
+            except OpenShiftPythonException as e:
+                if attempt == 0 or e.attributes().get("status_code") != 409:
+                    raise
+            # resourceVersion of the model was outdated, modify the current version of the object
+            self.refresh()
+        return RestResult("apply", status=1), False
+
     @property
     def committed(self):
-        """Returns True, if the objects is already committed to the server"""
+        """
+        Returns True, if the objects is already committed to the server.
+        Only objects found by an informer are trusted, the informer may not have seen an object created just now.
+        """
         if self._committed is None:
-            self._committed, _ = self.exists()
+            api_version, kind, name, namespace = self._rest_args()
+            cache = get_informer(self.context, api_version, kind, namespace)
+            if cache is not None and cache.get(name) is not None:
+                self._committed = True
+            else:
+                self._committed, _ = self.exists()
         return self._committed
 
     def commit(self):
@@ -30,12 +92,26 @@ class KubernetesObject(APIObject, LifecycleObject):
         Creates object on the server and returns created entity.
         It will be the same class but attributes might differ, due to server adding/rejecting some of them.
         """
+        if (rest := self.rest) is not None:
+            self.model = Model(rest.create(self.as_dict(), self.context.get_project()))
+            self._committed = True
+            return self
         self.create(["--save-config=true"])
         self._committed = True
         return self.refresh()
 
     def delete(self, ignore_not_found=True, cmd_args=None):
-        """Deletes the resource, by default ignored not found"""
+        """
+        Deletes the resource and waits until it is removed, by default ignored not found.
+        Deletions with `cmd_args` always use oc, as the arguments are oc command line arguments.
+        """
+        if (rest := self.rest) is not None and cmd_args is None:
+            api_version, kind, name, namespace = self._rest_args()
+            deleted = rest.delete(api_version, kind, name, namespace, ignore_not_found)
+            if deleted and not rest.wait_deleted(api_version, kind, name, namespace, timeout=30):
+                raise OpenShiftPythonException(f"Timeout waiting for {kind.lower()}/{name} to be deleted")
+            self._committed = False
+            return RestResult("delete", out=f"{kind.lower()}/{name}" if deleted else "")
         with timeout(30):
             deleted = super().delete(ignore_not_found, cmd_args)
             self._committed = False
@@ -43,10 +119,12 @@ class KubernetesObject(APIObject, LifecycleObject):
 
     def wait_until(self, test_function, timelimit=60):
         """Waits until the test function succeeds for this object"""
+        if (rest := self.rest) is not None:
+            return self._watch_until(rest, test_function, timelimit)
         try:
             with timeout(timelimit):
                 success, _, _ = self.self_selector().until_all(
-                    success_func=lambda obj: test_function(self.__class__(obj.model))
+                    success_func=lambda obj: test_function(self._with_model(obj.model))
                 )
                 self.refresh()
                 return success
@@ -55,6 +133,37 @@ class KubernetesObject(APIObject, LifecycleObject):
                 return False
             raise e
 
+    def _with_model(self, model):
+        """Returns copy of self with the model replaced, so test functions get the same class as self"""
+        # copy.copy() would use APIObject.__setstate__, which reads the object again with oc
+        obj = self.__class__.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__, model=Model(model))
+        return obj
+
+    def _watch_until(self, rest: KubernetesRestClient, test_function, timelimit) -> bool:
+        """Tests every version of the object sent by the watch, instead of polling it"""
+        api_version, kind, name, namespace = self._rest_args()
+        deadline = time.monotonic() + timelimit
+        while (remaining := deadline - time.monotonic()) > 0:
+            # (Re)start from the current version, either initially or when the watch expired
+            model = rest.get(api_version, kind, name, namespace)
+            if model is not None and test_function(self._with_model(model)):
+                self.model = Model(model)
+                return True
+            resource_version = model["metadata"]["resourceVersion"] if model else None
+            events = rest.watch(
+                api_version, kind, namespace, resource_version, f"metadata.name={name}", min(remaining, 300)
+            )
+            for event, model in events:
+                if event == "ERROR":
+                    break
+                if event != "DELETED" and test_function(self._with_model(model)):
+                    self.model = Model(model)
+                    return True
+                if time.monotonic() >= deadline:
+                    break
+        return False
+
 
 class CustomResource(KubernetesObject):
     """Custom APIObjects that implements methods that improves manipulation with CR objects"""
@@ -1,12 +1,17 @@
 """This module implements an KubernetesCLI interface using oc/kubectl binary commands."""
 
 from functools import cached_property
+from typing import Optional
 from urllib.parse import urlparse
 
+import httpx
 import openshift_client as oc
 from openshift_client import Context, OpenShiftPythonException
 
+from testsuite.kubernetes.informer import fresh_reads
+from testsuite.kubernetes.lookup import get_object
 from testsuite.kubernetes.openshift.route import OpenshiftRoute
+from testsuite.kubernetes.rest import Backend, BackendContext, KubernetesRestClient, backend_of, rest_client
 from .secret import Secret
 
 
@@ -15,25 +20,39 @@ class KubernetesClient:
 
     # pylint: disable=too-many-public-methods
 
-    def __init__(self, project: str = None, api_url: str = None, token: str = None, kubeconfig_path: str = None):
+    def __init__(
+        self,
+        project: str = None,
+        api_url: str = None,
+        token: str = None,
+        kubeconfig_path: str = None,
+        backend: Backend = None,
+    ):
         self._project = project
         self._api_url = api_url
         self._token = token
         self._kubeconfig_path = kubeconfig_path
+        self.backend = backend or Backend()
 
     @classmethod
     def from_context(cls, context: Context) -> "KubernetesClient":
         """Creates self from the context"""
-        return cls(context.get_project(), context.get_api_url(), context.get_token(), context.get_kubeconfig_path())
+        return cls(
+            context.get_project(),
+            context.get_api_url(),
+            context.get_token(),
+            context.get_kubeconfig_path(),
+            backend_of(context),
+        )
 
     def change_project(self, project) -> "KubernetesClient":
         """Return new self with a different project"""
-        return KubernetesClient(project, self._api_url, self._token, self._kubeconfig_path)
+        return KubernetesClient(project, self._api_url, self._token, self._kubeconfig_path, self.backend)
 
     @cached_property
     def context(self):
         """Prepare context for command execution"""
-        context = Context()
+        context = BackendContext(self.backend)
 
         context.project_name = self._project
         context.api_server = self._api_url
@@ -67,34 +86,62 @@ class KubernetesClient:
     @property
     def connected(self):
         """Returns True, if user is logged in and the project exists"""
+        if (rest := self.rest) is not None:
+            return self._rest_exists(rest, "v1", "Namespace", self._project)
         try:
             self.do_action("get", "ns", self._project)
         except OpenShiftPythonException:
             return False
         return True
 
-    def get_secret(self, name):
-        """Returns dict-like structure for accessing secret data"""
-        with self.context:
-            return oc.selector(f"secret/{name}").object(cls=Secret)
+    def _rest_exists(self, rest: KubernetesRestClient, api_version: str, kind: str, name: str) -> bool:
+        """Returns True if the object exists, False also if the API server is not reachable or denies the access"""
+        try:
+            return rest.get(api_version, kind, name, self.context.get_project()) is not None
+        except (OpenShiftPythonException, httpx.HTTPError):
+            return False
+
+    @property
+    def rest(self) -> Optional[KubernetesRestClient]:
+        """Returns client of the REST backend, None if oc is used"""
+        return rest_client(self.context) if self.backend.rest else None
+
+    def get_secret(self, name, fresh=False):
+        """
+        Returns dict-like structure for accessing secret data
+        :param fresh: Read the secret from the server even if it is cached by an informer
+        """
+        if fresh:
+            with fresh_reads():
+                return get_object(self.context, "v1", "Secret", name, cls=Secret)
+        return get_object(self.context, "v1", "Secret", name, cls=Secret)
 
     def service_exists(self, name) -> bool:
         """Returns True if service with the given name exists"""
+        if (rest := self.rest) is not None:
+            return rest.get("v1", "Service", name, self.context.get_project()) is not None
         with self.context:
             return oc.selector(f"svc/{name}").count_existing() == 1
 
     def get_route(self, name):
         """Returns dict-like structure for accessing secret data"""
-        with self.context:
-            return oc.selector(f"route/{name}").object(cls=OpenshiftRoute)
+        return get_object(self.context, "route.openshift.io/v1", "Route", name, cls=OpenshiftRoute)
 
     def get_routes_for_service(self, service_name: str) -> list[OpenshiftRoute]:
         """Returns list of routes for given service"""
+        if (rest := self.rest) is not None:
+            routes = rest.list(
+                "route.openshift.io/v1",
+                "Route",
+                self.context.get_project(),
+                field_selector=f"spec.to.name={service_name}",
+            )
+            return [OpenshiftRoute(model, context=self.context) for model in routes["items"]]
         with self.context:
             return oc.selector("route", field_selectors={"spec.to.name": service_name}).objects(cls=OpenshiftRoute)
 
     def do_action(self, verb: str, *args, auto_raise: bool = True, parse_output: bool = False):
-        """Run an oc command."""
+        """Run an oc command, even with the REST backend, as it passes any command line to oc"""
         with self.context:
             result = oc.invoke(verb, args, auto_raise=auto_raise)
             if parse_output:
@@ -113,6 +160,8 @@ class KubernetesClient:
     @property
     def project_exists(self):
         """Returns True if the project exists"""
+        if (rest := self.rest) is not None:
+            return self._rest_exists(rest, "project.openshift.io/v1", "Project", self.project)
         try:
             self.do_action("get", f"project/{self.project}")
             return True
@@ -0,0 +1,153 @@
+"""Session-wide caches of Kubernetes objects kept up to date by list+watch, so repeated lookups need no API calls"""
+
+import contextlib
+import copy
+import logging
+import threading
+from typing import Optional, Type, TypeVar
+
+from openshift_client import APIObject, Context
+
+from testsuite.kubernetes.rest import KubernetesRestClient, backend_of, rest_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=APIObject)
+
+_informers: dict[tuple, "Informer"] = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def informers_enabled(context: Context) -> bool:
+    """True, if Backend of the context enables informers, informers need the REST backend"""
+    backend = backend_of(context)
+    return backend.rest and backend.informers
+
+
+@contextlib.contextmanager
+def fresh_reads():
+    """Lookups in this thread bypass informers and read objects from the API server, e.g. right after a change"""
+    previous = getattr(_local, "fresh", False)
+    _local.fresh = True
+    try:
+        yield
+    finally:
+        _local.fresh = previous
+
+
+class Informer:  # pylint: disable=too-many-instance-attributes
+    """Cache of all objects of a kind in a namespace, listed once and then updated by a watch in a background thread"""
+
+    def __init__(self, rest: KubernetesRestClient, api_version: str, kind: str, namespace: str):
+        self.rest = rest
+        self.api_version = api_version
+        self.kind = kind
+        self.namespace = namespace
+        self._objects: dict[str, dict] = {}
+        self._resource_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"informer-{kind}-{namespace}", daemon=True)
+
+    def start(self):
+        """Lists the objects and starts watching them"""
+        self._list()
+        self._thread.start()
+
+    def stop(self):
+        """Stops the watch after its current request ends"""
+        self._stopped.set()
+
+    def _list(self):
+        collection = self.rest.list(self.api_version, self.kind, self.namespace)
+        with self._lock:
+            self._objects = {item["metadata"]["name"]: item for item in collection["items"]}
+            self._resource_version = collection["metadata"]["resourceVersion"]
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._list()
+                self._watch()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.warning("Watch of %s in %s failed, listing again", self.kind, self.namespace, exc_info=True)
+                self._resource_version = None
+                self._stopped.wait(1)
+
+    def _watch(self):
+        for event, obj in self.rest.watch(self.api_version, self.kind, self.namespace, self._resource_version):
+            if event == "ERROR":
+                # Usually 410 Gone, resourceVersion is too old to continue watching from it
+                self._resource_version = None
+                return
+            with self._lock:
+                if event == "DELETED":
+                    self._objects.pop(obj["metadata"]["name"], None)
+                elif event != "BOOKMARK":
+                    self._objects[obj["metadata"]["name"]] = obj
+                self._resource_version = obj["metadata"]["resourceVersion"]
+
+    def get(self, name: str) -> Optional[dict]:
+        """Returns copy of the object, None if it does not exist"""
+        with self._lock:
+            obj = self._objects.get(name)
+        return copy.deepcopy(obj) if obj is not None else None
+
+    def select(self, labels: dict[str, str]) -> list[dict]:
+        """Returns copies of objects that have all the labels"""
+        with self._lock:
+            objects = [
+                obj for obj in self._objects.values() if labels.items() <= (obj["metadata"].get("labels") or {}).items()
+            ]
+        return copy.deepcopy(objects)
+
+
+def get_informer(context: Context, api_version: str, kind: str, namespace: str = None) -> Optional[Informer]:
+    """
+    Returns informer of the kind in the namespace (the project of the context by default), starting it on first use.
+    Returns None, if informers are disabled or fresh reads were requested, callers then ask the API server
+    """
+    if getattr(_local, "fresh", False) or not informers_enabled(context):
+        return None
+    rest = rest_client(context)
+    namespace = namespace or context.get_project()
+    key = (id(rest), api_version, kind.lower(), namespace)
+    with _lock:
+        if key not in _informers:
+            informer = Informer(rest, api_version, kind, namespace)
+            # Registered only after the initial list succeeds, so a failed start is retried by the next lookup
+            informer.start()
+            _informers[key] = informer
+        return _informers[key]
+
+
+def cached_object(
+    context: Context,
+    api_version: str,
+    kind: str,
+    name: str = None,
+    labels: dict[str, str] = None,
+    cls: Type[T] = APIObject,  # type: ignore[assignment]
+) -> Optional[T]:
+    """
+    Returns the object with the name or the only object with the labels from the informer.
+    Returns None, if informers are not used or the cache does not have exactly one such object,
+    callers then fall back to selectors, which also report the errors.
+    """
+    if (cache := get_informer(context, api_version, kind)) is None:
+        return None
+    if name is not None:
+        obj = cache.get(name)
+        return cls(obj, context=context) if obj is not None else None
+    objects = cache.select(labels or {})
+    return cls(objects[0], context=context) if len(objects) == 1 else None
+
+
+def stop_informers():
+    """Stops and forgets all informers"""
+    with _lock:
+        for cache in _informers.values():
+            cache.stop()
+        _informers.clear()
@@ -0,0 +1,49 @@
+"""Lookups of single objects, which use informers, the REST backend or oc, whichever the context selects"""
+
+from typing import Type, TypeVar
+
+from openshift_client import APIObject, Context, OpenShiftPythonException, selector
+
+from testsuite.kubernetes.informer import cached_object
+from testsuite.kubernetes.rest import backend_of, rest_client
+
+T = TypeVar("T", bound=APIObject)
+
+
+def _resource(api_version: str, kind: str) -> str:
+    """Returns resource name for oc, qualified by the API group, e.g. `deployment.apps`"""
+    if "/" in api_version:
+        return f"{kind.lower()}.{api_version.split('/')[0]}"
+    return kind.lower()
+
+
+def get_object(
+    context: Context,
+    api_version: str,
+    kind: str,
+    name: str = None,
+    labels: dict[str, str] = None,
+    cls: Type[T] = APIObject,  # type: ignore[assignment]
+) -> T:
+    """
+    Returns the object with the name or the only object with the labels, same as `selector(...).object()`.
+    Raises OpenShiftPythonException, if there is not exactly one such object.
+    """
+    if (obj := cached_object(context, api_version, kind, name, labels, cls)) is not None:
+        return obj
+    resource = _resource(api_version, kind)
+    target = f"{resource}/{name}" if name else resource
+    if not backend_of(context).rest:
+        with context:
+            return selector(target, labels=labels).object(cls=cls)
+
+    rest = rest_client(context)
+    namespace = context.get_project()
+    if name is not None:
+        models = [model] if (model := rest.get(api_version, kind, name, namespace)) is not None else []
+    else:
+        label_selector = ",".join(f"{key}={value}" for key, value in (labels or {}).items())
+        models = rest.list(api_version, kind, namespace, label_selector=label_selector)["items"]
+    if len(models) != 1:
+        raise OpenShiftPythonException(f"Expected a single object, but selected {len(models)}: {target}")
+    return cls(models[0], context=context)
@@ -40,6 +40,7 @@ class OpenshiftRoute(KubernetesObject, Hostname):
         return cls(model, context=cluster.context)
 
     def client(self, **kwargs) -> KuadrantClient:
+        kwargs.setdefault("shared_transport", True)
         protocol = "http"
         if "tls" in self.model.spec:
             protocol = "https"
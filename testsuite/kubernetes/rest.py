@@ -0,0 +1,323 @@
+"""Backend talking to the Kubernetes API server directly over HTTP/2 instead of invoking oc/kubectl"""
+
+import base64
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import httpx
+import yaml
+from openshift_client import Context, OpenShiftPythonException
+
+from testsuite.certificates import Certificate
+from testsuite.httpx.tls import ssl_context
+
+
+@dataclass(frozen=True)
+class Backend:
+    """
+    Selects how KubernetesObjects talk to the cluster, set from the `kubernetes` settings by the settings loader
+    :param rest: Use the REST backend instead of oc
+    :param informers: Serve lookups from informers, needs the REST backend
+    """
+
+    rest: bool = False
+    informers: bool = False
+
+
+class BackendContext(Context):
+    """oc Context which also carries the Backend, objects created in it keep it in their copy of the context"""
+
+    def __init__(self, backend: Backend):
+        super().__init__()
+        self.backend = backend
+
+
+def backend_of(context: Context) -> Backend:
+    """Returns Backend of the context or of its closest parent, oc is used for contexts without one"""
+    while context is not None:
+        if isinstance(context, BackendContext):
+            return context.backend
+        context = context.parent
+    return Backend()
+
+
+def _read(entry: dict, key: str) -> Optional[str]:
+    """Returns `key-data` (base64) or content of the `key` file from a kubeconfig entry"""
+    if f"{key}-data" in entry:
+        return base64.b64decode(entry[f"{key}-data"]).decode("utf-8")
+    if key in entry:
+        return Path(entry[key]).expanduser().read_text(encoding="utf-8")
+    return None
+
+
+def _named(entries: list[dict], name: str, kind: str) -> dict:
+    for entry in entries or []:
+        if entry["name"] == name:
+            return entry[kind]
+    raise OpenShiftPythonException(f"Unable to find {kind} {name} in kubeconfig")
+
+
+@dataclass(frozen=True)
+class KubeConfig:
+    """Connection details of the current context of a kubeconfig"""
+
+    server: str
+    verify: Union[Certificate, bool]
+    cert: Optional[Certificate] = None
+    token: Optional[str] = None
+    namespace: str = "default"
+
+    @classmethod
+    def load(cls, path: str = None, api_url: str = None, token: str = None) -> "KubeConfig":
+        """
+        Loads current context of the kubeconfig, `api_url` and `token` override values from the kubeconfig.
+        If both are given, e.g. for clusters configured in settings, kubeconfig is not read at all,
+        as its current context may belong to a different cluster, and the server certificate is verified by system CAs.
+        :param path: Path to the kubeconfig, by default the first one from $KUBECONFIG or ~/.kube/config
+        """
+        if api_url is not None and token is not None:
+            return cls(api_url, True, token=token)
+
+        path = path or os.environ.get("KUBECONFIG", "").split(os.pathsep)[0] or "~/.kube/config"
+        try:
+            config = yaml.safe_load(Path(path).expanduser().read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise OpenShiftPythonException(
+                f"Kubeconfig {path} does not exist, set both api_url and token of the cluster instead"
+            ) from None
+        context = _named(config.get("contexts"), config["current-context"], "context")
+        cluster = _named(config.get("clusters"), context["cluster"], "cluster")
+        user = _named(config.get("users"), context["user"], "user") if token is None else {}
+
+        verify: Union[Certificate, bool] = True
+        if cluster.get("insecure-skip-tls-verify"):
+            verify = False
+        elif (ca := _read(cluster, "certificate-authority")) is not None:
+            verify = Certificate(key="", certificate=ca, chain=ca)
+
+        cert = None
+        client_cert, client_key = _read(user, "client-certificate"), _read(user, "client-key")
+        if client_cert is not None and client_key is not None:
+            cert = Certificate(key=client_key, certificate=client_cert, chain=client_cert)
+
+        if token is None:
+            token = user.get("token")
+            if token is None and "tokenFile" in user:
+                token = Path(user["tokenFile"]).expanduser().read_text(encoding="utf-8").strip()
+        if token is None and cert is None:
+            raise OpenShiftPythonException(f"Context {config['current-context']} has neither token nor certificate")
+
+        return cls(api_url or cluster["server"], verify, cert, token, context.get("namespace", "default"))
+
+
+@dataclass(frozen=True)
+class Resource:
+    """API resource of a kind, as reported by the API discovery"""
+
+    api_version: str
+    kind: str
+    plural: str
+    namespaced: bool
+
+    def path(self, namespace: str = None, name: str = None) -> str:
+        """Returns URL path of the collection or of a single object"""
+        prefix = "/api/v1" if self.api_version == "v1" else f"/apis/{self.api_version}"
+        if self.namespaced and namespace:
+            prefix += f"/namespaces/{namespace}"
+        return f"{prefix}/{self.plural}/{name}" if name else f"{prefix}/{self.plural}"
+
+
+class KubernetesRestClient:
+    """Client for the Kubernetes API, all requests are multiplexed over a pooled HTTP/2 connection"""
+
+    def __init__(self, config: KubeConfig):
+        self.config = config
+        headers = {"Authorization": f"Bearer {config.token}"} if config.token else {}
+        self.client = httpx.Client(
+            base_url=config.server,
+            http2=True,
+            verify=ssl_context(config.verify, config.cert, True),
+            headers=headers,
+            timeout=60,
+        )
+        self._resources: dict[str, dict[str, Resource]] = {}
+        self._lock = threading.Lock()
+
+    def resource(self, api_version: str, kind: str) -> Resource:
+        """Returns API resource of the kind, discovered resources are cached"""
+        with self._lock:
+            if api_version not in self._resources:
+                path = "/api/v1" if api_version == "v1" else f"/apis/{api_version}"
+                self._resources[api_version] = {
+                    resource["kind"].lower(): Resource(
+                        api_version, resource["kind"], resource["name"], resource["namespaced"]
+                    )
+                    for resource in self._send("GET", path)["resources"]  # type: ignore[index]
+                    if "/" not in resource["name"]
+                }
+        try:
+            return self._resources[api_version][kind.lower()]
+        except KeyError:
+            raise OpenShiftPythonException(f"Server does not have resource {kind} in {api_version}") from None
+
+    def _send(self, method: str, path: str, ignore_not_found: bool = False, **kwargs) -> Optional[dict]:
+        response = self.client.request(method, path, **kwargs)
+        if response.status_code == 404 and ignore_not_found:
+            return None
+        if response.is_error:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise OpenShiftPythonException(
+                f"{method} {path} failed with {response.status_code}: {message}", status_code=response.status_code
+            )
+        return response.json()
+
+    def _path(self, api_version: str, kind: str, namespace: str = None, name: str = None) -> str:
+        return self.resource(api_version, kind).path(namespace or self.config.namespace, name)
+
+    def get(self, api_version: str, kind: str, name: str, namespace: str = None) -> Optional[dict]:
+        """Returns the object, None if it does not exist"""
+        return self._send("GET", self._path(api_version, kind, namespace, name), ignore_not_found=True)
+
+    def get_metadata(self, api_version: str, kind: str, name: str, namespace: str = None) -> Optional[dict]:
+        """Returns only metadata of the object (PartialObjectMetadata), e.g. to check its resourceVersion cheaply"""
+        return self._send(
+            "GET",
+            self._path(api_version, kind, namespace, name),
+            ignore_not_found=True,
+            headers={"Accept": "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,application/json"},
+        )
+
+    def list(
+        self,
+        api_version: str,
+        kind: str,
+        namespace: str = None,
+        label_selector: str = None,
+        field_selector: str = None,
+    ) -> dict:
+        """Returns List of the objects with `items` and `metadata.resourceVersion` of the collection"""
+        params = {}
+        if label_selector:
+            params["labelSelector"] = label_selector
+        if field_selector:
+            params["fieldSelector"] = field_selector
+        collection: dict = self._send("GET", self._path(api_version, kind, namespace), params=params)  # type: ignore[assignment]
+        # Items of a List do not repeat apiVersion and kind, objects created from them need them
+        for item in collection["items"]:
+            item.setdefault("apiVersion", api_version)
+            item.setdefault("kind", self.resource(api_version, kind).kind)
+        return collection
+
+    def watch(
+        self,
+        api_version: str,
+        kind: str,
+        namespace: str = None,
+        resource_version: str = None,
+        field_selector: str = None,
+        timeout: float = 60,
+    ) -> Iterator[tuple[str, dict]]:
+        """
+        Streams (type, object) events of the watch, until the server ends it after `timeout` seconds.
+        Event types are ADDED, MODIFIED, DELETED and ERROR, ERROR object is a Status (e.g. 410 Gone).
+        :param resource_version: Events newer than this resourceVersion are sent, usually the one from get or list
+        """
+        params = {"watch": "1", "timeoutSeconds": str(max(int(timeout), 1))}
+        if resource_version:
+            params["resourceVersion"] = resource_version
+        if field_selector:
+            params["fieldSelector"] = field_selector
+        path = self._path(api_version, kind, namespace)
+        with self.client.stream("GET", path, params=params, timeout=httpx.Timeout(60, read=timeout + 10)) as response:
+            if response.is_error:
+                response.read()
+                raise OpenShiftPythonException(
+                    f"Watch of {path} failed with {response.status_code}: {response.text}",
+                    status_code=response.status_code,
+                )
+            for line in response.iter_lines():
+                if line:
+                    event = json.loads(line)
+                    yield event["type"], event["object"]
+
+    def create(self, model: dict, namespace: str = None) -> dict:
+        """Creates the object and returns it as it was stored by the server"""
+        namespace = model["metadata"].get("namespace", namespace)
+        path = self._path(model["apiVersion"], model["kind"], namespace)
+        return self._send("POST", path, json=model)  # type: ignore[return-value]
+
+    def replace(self, model: dict, namespace: str = None) -> dict:
+        """Replaces the object, fails with 409 Conflict if its resourceVersion is outdated"""
+        namespace = model["metadata"].get("namespace", namespace)
+        path = self._path(model["apiVersion"], model["kind"], namespace, model["metadata"]["name"])
+        return self._send("PUT", path, json=model)  # type: ignore[return-value]
+
+    def patch(self, api_version: str, kind: str, name: str, patch: dict, namespace: str = None) -> dict:
+        """Applies JSON merge patch to the object"""
+        return self._send(  # type: ignore[return-value]
+            "PATCH",
+            self._path(api_version, kind, namespace, name),
+            json=patch,
+            headers={"Content-Type": "application/merge-patch+json"},
+        )
+
+    def delete(self, api_version: str, kind: str, name: str, namespace: str = None, ignore_not_found=True) -> bool:
+        """Deletes the object, returns False if it did not exist"""
+        path = self._path(api_version, kind, namespace, name)
+        return self._send("DELETE", path, ignore_not_found=ignore_not_found) is not None
+
+    def wait_deleted(self, api_version: str, kind: str, name: str, namespace: str = None, timeout: float = 30) -> bool:
+        """
+        Waits until the object is removed from the server, like `oc delete --wait=true` it waits for finalizers.
+        Returns False if the object still exists after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            model = self.get(api_version, kind, name, namespace)
+            if model is None:
+                return True
+            resource_version = model["metadata"]["resourceVersion"]
+            for event, _ in self.watch(
+                api_version, kind, namespace, resource_version, f"metadata.name={name}", remaining
+            ):
+                if event == "DELETED":
+                    return True
+                if event == "ERROR" or time.monotonic() >= deadline:
+                    break
+        return False
+
+
+@lru_cache(maxsize=None)
+def _client(kubeconfig_path: Optional[str], api_url: Optional[str], token: Optional[str]) -> KubernetesRestClient:
+    return KubernetesRestClient(KubeConfig.load(kubeconfig_path, api_url, token))
+
+
+def rest_client(context: Context) -> KubernetesRestClient:
+    """Returns client for the cluster of the oc Context, clients (and their connections) are shared"""
+    return _client(context.get_kubeconfig_path(), context.get_api_url(), context.get_token())
+
+
+class RestResult:
+    """Result of an action of the REST backend, mimics the parts of openshift_client Result used by the testsuite"""
+
+    def __init__(self, action: str, status: int = 0, out: str = ""):
+        self.action = action
+        self._status = status
+        self._out = out
+
+    def status(self) -> int:
+        """Returns 0 if the action succeeded"""
+        return self._status
+
+    def out(self) -> str:
+        """Returns output of the action"""
+        return self._out
@@ -1,5 +1,6 @@
 """Root conftest"""
 
+import logging
 import signal
 from urllib.parse import urlparse
 
@@ -13,6 +14,8 @@ from testsuite.certificates import CFSSLClient
 from testsuite.config import settings
 from testsuite.gateway import Exposer, CustomReference
 from testsuite.httpx import KuadrantClient
+from testsuite.httpx.pool import transport_pool
+from testsuite.kubernetes.informer import stop_informers
 from testsuite.mockserver import Mockserver
 from testsuite.oidc import OIDCProvider
 from testsuite.oidc.auth0 import Auth0Provider
@@ -21,6 +24,8 @@ from testsuite.tracing.jaeger import JaegerClient
 from testsuite.tracing.tempo import RemoteTempoClient
 from testsuite.utils import randomize, _whoami
 
+logger = logging.getLogger(__name__)
+
 
 def pytest_addoption(parser):
     """Add options to include various kinds of tests in testrun"""
@@ -100,6 +105,21 @@ def term_handler():
     signal.signal(signal.SIGTERM, orig)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def shared_transports():
+    """Closes connections shared by Hostname clients at the end of the session and reports their reuse"""
+    yield transport_pool
+    logger.info("Shared transport pool statistics: %s", transport_pool.stats)
+    transport_pool.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def informers():
+    """Stops watches of informers started during the session, when `kubernetes.informers` is enabled"""
+    yield
+    stop_informers()
+
+
 def pytest_collection_modifyitems(session, config, items):  # pylint: disable=unused-argument
     """
     Add user properties to testcases for xml output
@@ -4,6 +4,7 @@ Tests that a single limit is enforced as expected over one iteration
 
 import pytest
 
+from testsuite.httpx import ResultList
 from testsuite.kuadrant.policy.rate_limit import Limit
 
 pytestmark = [pytest.mark.kuadrant_only, pytest.mark.limitador]
@@ -32,6 +33,6 @@ def rate_limit(rate_limit, limit):
 @pytest.mark.parametrize("rate_limit", ["route", "gateway"], indirect=True)
 def test_limit(client, limit):
     """Tests that simple limit is applied successfully"""
-    responses = client.get_many("/get", limit.limit)
+    responses = ResultList(client.iter_many("/get", limit.limit, stop_when=lambda result: result.status_code != 200))
     responses.assert_all(status_code=200)
     assert client.get("/get").status_code == 429
@@ -1,6 +1,11 @@
 """Module with Abstract Tracing client for traces management"""
 
 import abc
+import heapq
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from testsuite.httpx import Result
 
 
 class TracingClient(abc.ABC):
@@ -24,3 +29,18 @@ class TracingClient(abc.ABC):
     @abc.abstractmethod
     def search(self, request_id: str, service: str, tags: dict) -> list:
         """Search traces in tracing client by tags service name, `authorino.request_id` and tag"""
+
+    def search_slowest(
+        self, results: "list[Result]", service: str, count: int = 10, tags: dict = None
+    ) -> "list[tuple[Result, list]]":
+        """
+        Returns traces of the `count` slowest requests, which were sent by a client with `correlate_requests=True`,
+        paired with their Results, slowest first
+        """
+        correlated = [
+            (result.latency, result.correlation.request_id, result)
+            for result in results
+            if result.correlation is not None and result.latency is not None
+        ]
+        slowest = heapq.nlargest(count, correlated, key=lambda item: item[0])
+        return [(result, self.search(request_id, service, dict(tags or {}))) for _, request_id, result in slowest]